@@ -4,82 +4,256 @@ PostToolUse Hook for Claude Code
 This hook runs after Claude uses a tool that modifies files.
 It reads the .post-claude-edit-config.yaml file to determine what checks
 to run based on the modified file's path.
+
+PyYAML is only imported when the config file exists and its JSON cache is
+missing or stale, so edits in projects without a config (and most edits in
+projects with one) never pay for the import.
 """
 
+import contextlib
+import fnmatch
 import json
 import os
+import re
+import shlex
 import subprocess
 import sys
-from fnmatch import fnmatch
-from pathlib import Path
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
 try:
-    import yaml
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
 except ImportError:
-    print("Error: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
-    sys.exit(1)
+    _json_loads = json.loads
 
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
 
-def load_config(project_dir: str) -> dict[str, Any] | None:
-    """Load the .post-claude-edit-config.yaml file."""
-    config_path = Path(project_dir) / ".post-claude-edit-config.yaml"
 
-    if not config_path.exists():
+# Regex that never matches, used for checks without any patterns
+_NEVER_MATCH = re.compile(r"(?!)")
+
+# Characters that need a shell to interpret; commands without them are exec'd directly
+_SHELL_SYNTAX = re.compile(r"[|&;<>$`*?{}\[\]()~\n]")
+_PLACEHOLDERS = re.compile(r"\{(?:file|dir)\}")
+_ENV_ASSIGNMENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*=")
+
+# Command output beyond this many characters is dropped
+_MAX_OUTPUT_CHARS = 256 * 1024
+
+# Output from a successful check is only reported if it mentions one of these
+_INTEREST_RE = re.compile(r"warning|error|fixed|found", re.IGNORECASE)
+
+# Parsed configs keyed by path, tagged with the (mtime_ns, size, inode) they were read at.
+# Cached dicts are shared between callers and must be treated as read-only.
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+
+
+def _parse_yaml(config_path: str) -> Any:
+    """Parse a YAML file, importing PyYAML only when it is actually needed.
+
+    Callers must have already checked that the file exists.
+    """
+    try:
+        import yaml
+    except ImportError:
+        print("Error: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
+        sys.exit(1)
+
+    # Prefer the libyaml-backed loader when PyYAML was built against libyaml.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(config_path) as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _read_sidecar(sidecar_path: str, sig: tuple[int, int, int]) -> dict[str, Any] | None:
+    """Return the cached config from the JSON sidecar if it matches ``sig``."""
+    try:
+        with open(sidecar_path, "rb") as f:
+            cached = _json_loads(f.read())
+    except (OSError, ValueError):
         return None
 
+    if not isinstance(cached, dict) or cached.get("source") != list(sig):
+        return None
+    return cached.get("config")
+
+
+def _write_sidecar(sidecar_path: str, sig: tuple[int, int, int], config: dict[str, Any]) -> None:
+    """Atomically write the parsed config to the JSON sidecar, ignoring failures."""
+    directory = os.path.dirname(sidecar_path)
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-            return config if config else None
-    except Exception as e:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"source": list(sig), "config": config}, f)
+        os.replace(tmp_path, sidecar_path)
+    except (OSError, TypeError, ValueError):
+        # Unwritable directory or a config with non-JSON values: just skip the cache
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+
+
+def _to_format_template(text: str) -> str:
+    """Turn a command using ``{file}``/``{dir}`` placeholders into a str.format template."""
+    escaped = text.replace("{", "{{").replace("}", "}}")
+    return escaped.replace("{{file}}", "{file}").replace("{{dir}}", "{dir}")
+
+
+def _compile_command(command: str) -> str | list[str]:
+    """Precompile a check's command into a format template.
+
+    Commands without shell syntax become a tokenized argv, so they can be
+    exec'd directly and placeholders are substituted per argument (paths with
+    spaces stay a single argument). Anything using pipes, redirection,
+    globbing, variables etc. stays a single string run through the shell.
+    """
+    if _SHELL_SYNTAX.search(_PLACEHOLDERS.sub("", command)):
+        return _to_format_template(command)
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        # Unbalanced quotes; leave it to the shell to run (or reject) as written
+        return _to_format_template(command)
+    if argv and _ENV_ASSIGNMENT.match(argv[0]):
+        # "NAME=value cmd" sets an environment variable, which only the shell does
+        return _to_format_template(command)
+    return [_to_format_template(arg) for arg in argv]
+
+
+def _compile_checks(config: dict[str, Any]) -> None:
+    """Precompile glob patterns and command templates.
+
+    Each check gets a ``_pattern_re`` covering its own patterns and a
+    ``_command`` template for run_command, and the config gets an
+    ``_any_pattern_re`` covering every enabled check so files that no check
+    cares about can be rejected with a single match.
+    """
+    all_patterns = []
+    for check in config.get("checks") or []:
+        patterns = check.get("patterns") or []
+        if patterns:
+            check["_pattern_re"] = re.compile(
+                "|".join(f"(?:{fnmatch.translate(p)})" for p in patterns)
+            )
+        else:
+            check["_pattern_re"] = _NEVER_MATCH
+        if check.get("enabled", True):
+            all_patterns.extend(patterns)
+
+        command = check.get("command")
+        if command:
+            check["_command"] = _compile_command(command)
+
+    if all_patterns:
+        config["_any_pattern_re"] = re.compile(
+            "|".join(f"(?:{fnmatch.translate(p)})" for p in all_patterns)
+        )
+    else:
+        config["_any_pattern_re"] = _NEVER_MATCH
+
+
+def load_config(project_dir: str) -> dict[str, Any] | None:
+    """Load the .post-claude-edit-config.yaml file.
+
+    The hook runs as a fresh process per edit, so the parsed config is also
+    persisted to a JSON sidecar (``.post-claude-edit-config.cache.json``) that
+    is reused until the YAML's mtime, size or inode changes. This avoids
+    importing PyYAML at all on the common path. The returned dict must not be
+    mutated.
+    """
+    config_path = os.path.join(project_dir, ".post-claude-edit-config.yaml")
+    sidecar_path = os.path.join(project_dir, ".post-claude-edit-config.cache.json")
+
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
         print(f"Error reading config file: {e}", file=sys.stderr)
         return None
 
+    sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    config = _read_sidecar(sidecar_path, sig)
+    if config is None:
+        try:
+            config = _parse_yaml(config_path)
+        except Exception as e:
+            print(f"Error reading config file: {e}", file=sys.stderr)
+            return None
+
+        if not config:
+            return None
+
+        _write_sidecar(sidecar_path, sig, config)
+
+    _compile_checks(config)
+    _CONFIG_CACHE[config_path] = (sig, config)
+    return config
+
 
 def get_file_path_from_input() -> str | None:
     """Extract file path from stdin JSON."""
     try:
-        input_data = json.load(sys.stdin)
+        input_data = _json_loads(sys.stdin.buffer.read())
         file_path = input_data.get("tool_input", {}).get("file_path")
         return file_path
-    except json.JSONDecodeError:
+    except ValueError:
         return None
     except Exception as e:
         print(f"Error parsing input: {e}", file=sys.stderr)
         return None
 
 
-def matches_patterns(file_path: str, patterns: list[str]) -> bool:
-    """Check if file path matches any of the patterns."""
-    for pattern in patterns:
-        if fnmatch(file_path, pattern) or fnmatch(Path(file_path).name, pattern):
-            return True
-    return False
+def run_command(command: str | list[str], file_path: str, project_dir: str) -> tuple[bool, str]:
+    """Run a precompiled command with file path substitution.
 
+    Args:
+        command: Template from _compile_command; a string is run through the
+            shell, an argv list is exec'd directly
+        file_path: Edited file, substituted for ``{file}``
+        project_dir: Working directory for the command
 
-def run_command(command: str, file_path: str, project_dir: str) -> tuple[bool, str]:
-    """Run a command with file path substitution."""
+    Returns:
+        Tuple of (success, combined stdout/stderr)
+    """
     # Substitute placeholders
-    cmd = command.replace("{file}", file_path)
-    cmd = cmd.replace("{dir}", str(Path(file_path).parent))
+    values = {"file": file_path, "dir": os.path.dirname(file_path) or "."}
+    shell = isinstance(command, str)
+    if isinstance(command, str):
+        cmd: str | list[str] = command.format_map(values)
+    else:
+        cmd = [arg.format_map(values) for arg in command]
 
     try:
         result = subprocess.run(
-            cmd, shell=True, cwd=project_dir, capture_output=True, text=True, timeout=30
+            cmd, shell=shell, cwd=project_dir, capture_output=True, text=True, timeout=30
         )
 
         output = result.stdout + result.stderr
+        if len(output) > _MAX_OUTPUT_CHARS:
+            # Diagnostics worth surfacing are at the top; don't hand megabytes back to Claude
+            output = output[:_MAX_OUTPUT_CHARS] + "\n... [output truncated]"
         success = result.returncode == 0
         return success, output
     except subprocess.TimeoutExpired:
-        return False, f"Command timed out: {cmd}"
+        shown = cmd if isinstance(cmd, str) else shlex.join(cmd)
+        return False, f"Command timed out: {shown}"
     except Exception as e:
         return False, f"Error running command: {e}"
 
 
-def main():
-    """Main hook logic."""
+def run_hook() -> dict[str, Any]:
+    """Run the checks for the edited file and build the hook response."""
     project_dir = os.getenv("CLAUDE_PROJECT_DIR")
     if not project_dir:
         # Fallback to current directory
@@ -89,37 +263,64 @@ def main():
     file_path = get_file_path_from_input()
     if not file_path:
         # No file to process
-        print("{}")
-        return
+        return {}
 
     # Load configuration
     config = load_config(project_dir)
     if not config or "checks" not in config:
         # No configuration found, return empty response
-        print("{}")
-        return
+        return {}
+
+    # Bail out early when no enabled check could match this file
+    # Plain string split; avoids building a Path object for every hook run
+    file_name = file_path.rpartition("/")[2]
+    any_pattern_re = config["_any_pattern_re"]
+    if not (any_pattern_re.match(file_path) or any_pattern_re.match(file_name)):
+        return {}
 
     # Find matching checks
     checks = config.get("checks", [])
     matching_checks = [
         check
         for check in checks
-        if check.get("enabled", True) and matches_patterns(file_path, check.get("patterns", []))
+        if check.get("enabled", True)
+        and (check["_pattern_re"].match(file_path) or check["_pattern_re"].match(file_name))
     ]
 
     if not matching_checks:
         # No matching checks
-        print("{}")
-        return
+        return {}
 
-    # Run matching checks and collect output
-    results = []
-    for check in matching_checks:
-        command = check.get("command")
-        if not command:
-            continue
+    # Run matching checks and collect output. Checks that rewrite the file
+    # (e.g. `ruff --fix`, `ruff format`) run one at a time first so they don't
+    # race each other; the remaining read-only checks then run concurrently.
+    runnable = [check for check in matching_checks if "_command" in check]
+    outputs: dict[int, tuple[bool, str]] = {}
 
-        success, output = run_command(command, file_path, project_dir)
+    read_only = []
+    for index, check in enumerate(runnable):
+        if check.get("modifies_file", False):
+            outputs[index] = run_command(check["_command"], file_path, project_dir)
+        else:
+            read_only.append(index)
+
+    if len(read_only) == 1:
+        index = read_only[0]
+        outputs[index] = run_command(runnable[index]["_command"], file_path, project_dir)
+    elif read_only:
+        with ThreadPoolExecutor(max_workers=len(read_only)) as executor:
+            futures = {
+                executor.submit(
+                    run_command, runnable[index]["_command"], file_path, project_dir
+                ): index
+                for index in read_only
+            }
+            for future in as_completed(futures):
+                outputs[futures[future]] = future.result()
+
+    results = []
+    for index, check in enumerate(runnable):
+        success, output = outputs[index]
         results.append(
             {
                 "name": check.get("name", "unknown"),
@@ -147,8 +348,7 @@ def main():
             continue
 
         # For successful checks with output, only include if there are warnings or fixes
-        output_lower = output.lower()
-        if any(indicator in output_lower for indicator in ["warning", "error", "fixed", "found"]):
+        if _INTEREST_RE.search(output):
             context_lines.append(f"[{result['name']}]")
             context_lines.append(output)
             context_lines.append("")
@@ -156,17 +356,27 @@ def main():
     additional_context = "\n".join(context_lines).strip() if context_lines else ""
 
     # Return results as JSON
-    if additional_context:
-        response = {
-            "hookSpecificOutput": {
-                "hookEventName": "PostToolUse",
-                "additionalContext": additional_context,
-            }
+    if not additional_context:
+        return {}
+
+    return {
+        "hookSpecificOutput": {
+            "hookEventName": "PostToolUse",
+            "additionalContext": additional_context,
         }
-    else:
-        response = {}
+    }
+
 
-    print(json.dumps(response))
+def emit_response(response: dict[str, Any]) -> None:
+    """Write the hook response JSON to stdout as bytes."""
+    sys.stdout.buffer.write(_json_dumps(response) if response else b"{}")
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.flush()
+
+
+def main():
+    """Main hook logic."""
+    emit_response(run_hook())
 
 
 if __name__ == "__main__":
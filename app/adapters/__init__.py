@@ -8,6 +8,10 @@ from app.adapters.base import (
     ReactionCapable,
     RichFormattingCapable,
     StreamingCapable,
+    is_interactive_capable,
+    is_reaction_capable,
+    is_rich_formatting_capable,
+    is_streaming_capable,
 )
 from app.adapters.email import EmailChannelAdapter
 from app.adapters.models import (
@@ -32,4 +36,8 @@ __all__ = [
     "RichMessage",
     "SlackChannelAdapter",
     "StreamingCapable",
+    "is_interactive_capable",
+    "is_reaction_capable",
+    "is_rich_formatting_capable",
+    "is_streaming_capable",
 ]
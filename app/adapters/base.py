@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Protocol, runtime_checkable
+from typing import Protocol
 from uuid import UUID
 
 from app.adapters.models import (
@@ -137,7 +137,6 @@ class ChannelAdapter(ABC):
         pass
 
 
-@runtime_checkable
 class StreamingCapable(Protocol):
     """Adapters that support real-time message updates."""
 
@@ -157,7 +156,6 @@ class StreamingCapable(Protocol):
         ...
 
 
-@runtime_checkable
 class RichFormattingCapable(Protocol):
     """Adapters that support structured/rich content beyond plain text."""
 
@@ -182,7 +180,6 @@ class RichFormattingCapable(Protocol):
         ...
 
 
-@runtime_checkable
 class InteractiveCapable(Protocol):
     """Adapters that support buttons, forms, menus, etc."""
 
@@ -218,7 +215,6 @@ class InteractiveCapable(Protocol):
         ...
 
 
-@runtime_checkable
 class ReactionCapable(Protocol):
     """Adapters that support reactions/emoji responses."""
 
@@ -247,3 +243,24 @@ class ReactionCapable(Protocol):
             reaction: Reaction name/emoji to remove
         """
         ...
+
+
+# Runtime capability checks; the protocols above are for type checking only
+def is_streaming_capable(adapter: object) -> bool:
+    """Check whether an adapter implements StreamingCapable."""
+    return hasattr(adapter, "stream_message_chunk")
+
+
+def is_rich_formatting_capable(adapter: object) -> bool:
+    """Check whether an adapter implements RichFormattingCapable."""
+    return hasattr(adapter, "send_rich_message")
+
+
+def is_interactive_capable(adapter: object) -> bool:
+    """Check whether an adapter implements InteractiveCapable."""
+    return hasattr(adapter, "send_interactive_message") and hasattr(adapter, "handle_interaction")
+
+
+def is_reaction_capable(adapter: object) -> bool:
+    """Check whether an adapter implements ReactionCapable."""
+    return hasattr(adapter, "add_reaction") and hasattr(adapter, "remove_reaction")
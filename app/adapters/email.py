@@ -1,19 +1,22 @@
 """Email channel adapter implementation using Mailgun."""
 
-import hashlib
+import asyncio
 import hmac
 import logging
 import time
 from uuid import UUID
 
 import aiohttp
+from pydantic_core import from_json
 
 from app.adapters.base import AdapterCapabilities, ChannelAdapter, MessageStyle
 from app.adapters.models import ReceivedMessage
-from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of bytes of a Mailgun error response to read for logging
+_MAX_ERROR_BODY = 2048
+
 
 class EmailChannelAdapter(ChannelAdapter):
     """Email adapter using Mailgun for sending and receiving.
@@ -22,18 +25,41 @@ class EmailChannelAdapter(ChannelAdapter):
     Handles both sending via Mailgun API and receiving via webhooks.
     """
 
-    def __init__(self, mailgun_api_key: str, mailgun_domain: str):
+    def __init__(self, mailgun_api_key: str, mailgun_domain: str, from_email: str):
         """Initialize email adapter with Mailgun credentials.
 
         Args:
             mailgun_api_key: Mailgun API key for authentication
             mailgun_domain: Mailgun domain for sending emails
+            from_email: Sender address for outgoing emails
         """
         self.mailgun_api_key = mailgun_api_key
+        self._mailgun_api_key_bytes = mailgun_api_key.encode()
         self.mailgun_domain = mailgun_domain
         self.mailgun_api_url = f"https://api.mailgun.net/v3/{mailgun_domain}"
-        settings = get_settings()
-        self.from_email = settings.mailgun_from_email
+        self.from_email = from_email
+        self._auth = aiohttp.BasicAuth("api", mailgun_api_key)
+        # Created lazily on first send so the adapter can be built outside an event loop
+        self._session: aiohttp.ClientSession | None = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use.
+
+        Reusing one session keeps connections to Mailgun alive between sends
+        instead of paying for a new TCP/TLS handshake per email.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75, ttl_dns_cache=300),
+                auth=self._auth,
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session, if one was opened."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     @property
     def capabilities(self) -> AdapterCapabilities:
@@ -118,16 +144,20 @@ class EmailChannelAdapter(ChannelAdapter):
             logger.warning("Invalid timestamp")
             return False
 
+        # Compare raw digests rather than hex strings
+        try:
+            signature_bytes = bytes.fromhex(signature)
+        except (ValueError, TypeError):
+            logger.warning("Malformed signature")
+            return False
+
         # Compute the expected signature
-        msg = f"{timestamp}{token}".encode()
-        expected_signature = hmac.new(
-            self.mailgun_api_key.encode(),
-            msg,
-            hashlib.sha256,
-        ).hexdigest()
+        msg = timestamp.encode() + token.encode()
+        # Passing the digest by name lets hmac use OpenSSL's one-shot HMAC directly
+        expected_signature = hmac.digest(self._mailgun_api_key_bytes, msg, "sha256")
 
         # Constant-time comparison to prevent timing attacks
-        return hmac.compare_digest(signature, expected_signature)
+        return hmac.compare_digest(signature_bytes, expected_signature)
 
     async def send_message(
         self,
@@ -176,29 +206,49 @@ class EmailChannelAdapter(ChannelAdapter):
             email_data["h:In-Reply-To"] = thread_id
 
         # Send via Mailgun REST API
-        async with aiohttp.ClientSession() as session:
-            auth = aiohttp.BasicAuth("api", self.mailgun_api_key)
-            try:
-                async with session.post(
-                    f"{self.mailgun_api_url}/messages",
-                    data=email_data,
-                    auth=auth,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        message_id = result.get("id", "")
-                        logger.info(f"Email sent to {recipient}: {message_id}")
-                        return message_id
-                    else:
-                        error_text = await resp.text()
-                        logger.error(
-                            f"Failed to send email via Mailgun: {resp.status} {error_text}"
-                        )
-                        raise RuntimeError(f"Mailgun API error: {resp.status}")
-            except aiohttp.ClientError as e:
-                logger.error(f"Network error sending email via Mailgun: {e}")
-                raise RuntimeError(f"Failed to contact Mailgun: {e}") from e
+        session = await self._get_session()
+        try:
+            async with session.post(
+                f"{self.mailgun_api_url}/messages",
+                data=email_data,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                if resp.status == 200:
+                    result = from_json(await resp.read())
+                    message_id = result.get("id", "")
+                    logger.info(f"Email sent to {recipient}: {message_id}")
+                    return message_id
+                else:
+                    # Only the head of the body is useful for logs; Mailgun can return large HTML pages
+                    error_text = (await resp.content.read(_MAX_ERROR_BODY)).decode(errors="replace")
+                    logger.error(f"Failed to send email via Mailgun: {resp.status} {error_text}")
+                    raise RuntimeError(f"Mailgun API error: {resp.status}")
+        except aiohttp.ClientError as e:
+            logger.error(f"Network error sending email via Mailgun: {e}")
+            raise RuntimeError(f"Failed to contact Mailgun: {e}") from e
+
+    async def send_messages_bulk(
+        self, items: list[tuple[str, UUID, str | None, dict | None]]
+    ) -> list[str]:
+        """Send several emails concurrently over the shared HTTP session.
+
+        Args:
+            items: (message, conversation_id, thread_id, metadata) tuples, as
+                accepted by send_message
+
+        Returns:
+            Mailgun message IDs, in the same order as items
+
+        Raises:
+            ValueError: If required metadata is missing for any item
+            RuntimeError: If any send fails
+        """
+        return await asyncio.gather(
+            *(
+                self.send_message(message, conversation_id, thread_id, metadata)
+                for message, conversation_id, thread_id, metadata in items
+            )
+        )
 
     async def get_new_messages(self) -> list[ReceivedMessage]:
         """Mailgun uses webhooks for incoming emails, no polling needed.
@@ -1,52 +1,49 @@
-"""Domain models for channel adapters."""
+"""Domain models for channel adapters.
 
-from uuid import UUID
+These are plain slotted dataclasses rather than Pydantic models: they are built
+by adapters from already-parsed webhook payloads on every inbound event and
+never cross an API boundary, so validation would only add overhead.
+"""
 
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from uuid import UUID
 
 
-class ReceivedMessage(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ReceivedMessage:
     """Message received from an external channel."""
 
-    content: str = Field(..., description="The actual message text")
-    sender_id: str = Field(..., description="User identifier in the channel")
-    conversation_id: UUID | None = Field(None, description="ID to link back to conversation thread")
-    thread_id: str = Field(..., description="Channel-specific thread/conversation ID")
-    metadata: dict = Field(
-        default_factory=dict,
-        description="Channel-specific data (attachments, reactions, etc.)",
-    )
+    content: str  # The actual message text
+    sender_id: str  # User identifier in the channel
+    conversation_id: UUID | None = None  # ID to link back to conversation thread
+    thread_id: str  # Channel-specific thread/conversation ID
+    # Channel-specific data (attachments, reactions, etc.)
+    metadata: dict = field(default_factory=dict)
 
 
-class RichMessage(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class RichMessage:
     """Message with rich formatting capabilities."""
 
-    text: str = Field(..., description="Main text content")
-    fallback_text: str = Field(
-        ..., description="Plain text fallback for clients without rich formatting support"
-    )
-    formatting: dict = Field(
-        default_factory=dict, description="Formatting details (markdown, html, etc.)"
-    )
+    text: str  # Main text content
+    fallback_text: str  # Plain text fallback for clients without rich formatting support
+    formatting: dict = field(default_factory=dict)  # Formatting details (markdown, html, etc.)
 
 
-class InteractiveMessage(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class InteractiveMessage:
     """Message with interactive elements (buttons, forms, etc.)."""
 
-    text: str = Field(..., description="Message text")
-    buttons: list[dict] = Field(
-        default_factory=list,
-        description="List of buttons with action_id and value",
-    )
-    metadata: dict = Field(
-        default_factory=dict, description="Additional metadata for interactive elements"
-    )
+    text: str  # Message text
+    buttons: list[dict] = field(default_factory=list)  # Buttons with action_id and value
+    metadata: dict = field(default_factory=dict)  # Additional metadata for interactive elements
 
 
-class InteractionResponse(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class InteractionResponse:
     """Response to user interaction with interactive elements."""
 
-    conversation_id: UUID = Field(..., description="Associated conversation ID")
-    action_id: str = Field(..., description="The action that was triggered")
-    value: str = Field(..., description="The value associated with the action")
-    user_id: str = Field(..., description="The user who triggered the interaction")
+    conversation_id: UUID  # Associated conversation ID
+    action_id: str  # The action that was triggered
+    value: str  # The value associated with the action
+    user_id: str  # The user who triggered the interaction
@@ -1,9 +1,13 @@
 """Slack channel adapter implementation."""
 
-import hashlib
+import asyncio
 import hmac
 import logging
+import re
 import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import ClassVar
 from uuid import UUID
 
 from slack_sdk.web.async_client import AsyncWebClient
@@ -26,6 +30,63 @@ from app.adapters.models import (
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import; verify_request runs on every inbound Slack request
+_compare_digest = hmac.compare_digest
+_time = time.time
+_monotonic = time.monotonic
+
+# Minimum seconds between chat.update calls for one streamed message; Slack
+# rate limits chat.update to roughly one call per second per channel
+_STREAM_UPDATE_INTERVAL = 1.0
+
+# Placeholder for interactions on threads with no known conversation
+_UNKNOWN_CONVERSATION_ID = UUID(int=0)
+
+# Leading user mention such as "<@U0123ABCD>" or "<@U0123ABCD|name>", stripped
+# from app_mention text when the bot's own user id is not in the payload.
+_MENTION_RE = re.compile(r"^\s*<@[UW][A-Z0-9]+(?:\|[^>]*)?>\s*")
+
+
+def _strip_bot_mention(text: str, bot_user_id: str | None) -> str:
+    """Remove the bot's own leading mention from app_mention text.
+
+    Mentions of other users, and of the bot later in the text, are part of
+    the message and are kept.
+
+    Args:
+        text: Raw message text
+        bot_user_id: The bot's Slack user id, from the event's authorizations
+
+    Returns:
+        Text without the bot mention
+    """
+    if bot_user_id is None:
+        return _MENTION_RE.sub("", text, count=1).strip()
+    pattern = rf"^\s*<@{re.escape(bot_user_id)}(?:\|[^>]*)?>\s*"
+    return re.sub(pattern, "", text, count=1).strip()
+
+
+def _bot_user_id(event: dict) -> str | None:
+    """Get the bot's user id from an event callback's authorizations."""
+    for authorization in event.get("authorizations") or ():
+        if authorization.get("is_bot"):
+            return authorization.get("user_id")
+    return None
+
+
+@dataclass(slots=True)
+class _StreamState:
+    """Chunks received for a streamed message and its pending update."""
+
+    parts: list[str] = field(default_factory=list)
+    last_update: float = float("-inf")
+    updater: asyncio.Task[None] | None = None
+
+
+def _section_block(text: str) -> dict:
+    """Build a Block Kit section block with mrkdwn text."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
 
 class SlackChannelAdapter(
     ChannelAdapter, StreamingCapable, RichFormattingCapable, InteractiveCapable, ReactionCapable
@@ -41,7 +102,9 @@ class SlackChannelAdapter(
         """
         self.bot_token = bot_token
         self.signing_secret = signing_secret
-        self._streaming_messages: dict[str, str] = {}  # Track message_id for updates
+        # Keyed HMAC state; copying it per request skips re-deriving the key pads
+        self._hmac_template = hmac.new(signing_secret.encode(), digestmod="sha256")
+        self._streaming_messages: dict[str, _StreamState] = {}  # message_id -> streamed chunks
         self._message_channels: dict[str, str] = {}  # Track message_id -> channel mapping
         self._conversation_mappings: dict[str, UUID] = {}  # Track thread_id -> conversation_id
 
@@ -75,73 +138,73 @@ class SlackChannelAdapter(
             raise ValueError(f"Unexpected event type: {event.get('type')}")
 
         event_data = event.get("event", {})
+        event_type = event_data.get("type")
 
-        # Handle app_mention events
-        if event_data.get("type") == "app_mention":
-            return self._parse_app_mention(event_data)
-
-        # Handle message events
-        elif event_data.get("type") == "message":
-            return self._parse_message(event_data)
-
-        else:
-            raise ValueError(f"Unsupported event type: {event_data.get('type')}")
+        parser = self._EVENT_PARSERS.get(event_type)
+        if parser is None:
+            raise ValueError(f"Unsupported event type: {event_type}")
+        return parser(self, event_data, _bot_user_id(event))
 
     async def verify_request(self, request: dict) -> bool:
         """Verify Slack request signature.
 
         Args:
-            request: Raw request data including headers
+            request: Request data with "signature" (X-Slack-Signature header),
+                "timestamp" (X-Slack-Request-Timestamp header) and "body" (raw
+                request body bytes)
 
         Returns:
             True if signature is valid, False otherwise
         """
-        # Slack includes these headers for signature verification
-        # Headers may be lowercase when converted to dict
-        headers = request.get("headers", {})
-        slack_signature = headers.get("x-slack-signature", "") or headers.get("X-Slack-Signature", "")
-        slack_timestamp = headers.get("x-slack-request-timestamp", "") or headers.get("X-Slack-Request-Timestamp", "")
+        # Slack sends these as headers for signature verification
+        slack_signature = request.get("signature", "")
+        slack_timestamp = request.get("timestamp", "")
+
+        # Validate the timestamp up front instead of catching int() failures
+        if not isinstance(slack_timestamp, str) or not (
+            slack_timestamp.isascii() and slack_timestamp.isdigit() and len(slack_timestamp) <= 10
+        ):
+            logger.warning("Invalid timestamp format: %s", slack_timestamp)
+            return False
 
         # Verify timestamp is not too old (prevent replay attacks)
-        try:
-            request_time = int(slack_timestamp)
-            time_diff = abs(time.time() - request_time)
-            logger.debug(f"  Time diff: {time_diff} seconds")
-            if time_diff > 300:  # 5 minute window
-                logger.warning(f"Request timestamp too old, possible replay attack (diff: {time_diff}s)")
-                return False
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid timestamp format: {slack_timestamp} - {e}")
+        time_diff = abs(int(_time()) - int(slack_timestamp))
+        logger.debug("  Time diff: %d seconds", time_diff)
+        if time_diff > 300:  # 5 minute window
+            logger.warning(
+                "Request timestamp too old, possible replay attack (diff: %ds)", time_diff
+            )
             return False
 
-        # Reconstruct signing secret
-        body = request.get("body", "")
-        if isinstance(body, dict):
-            # If body is already parsed, reconstruct raw format
-            import json
-
-            body = json.dumps(body)
+        # Reconstruct the signed payload. Slack signs the raw request bytes, so the
+        # body should be passed through exactly as received.
+        body: bytes | str = request.get("body", b"")
+        if isinstance(body, str):
+            body = body.encode()
 
-        sig_basestring = f"v0:{slack_timestamp}:{body}"
+        sig_basestring = b"v0:" + slack_timestamp.encode() + b":" + body
 
         # Calculate expected signature
-        my_signature = (
-            "v0="
-            + hmac.new(
-                self.signing_secret.encode(), sig_basestring.encode(), hashlib.sha256
-            ).hexdigest()
-        )
+        mac = self._hmac_template.copy()
+        mac.update(sig_basestring)
+        my_signature = "v0=" + mac.hexdigest()
+
+        # Compare signatures
+        is_valid = _compare_digest(my_signature, slack_signature)
 
         # Debug logging
-        logger.debug(f"Slack signature verification:")
-        logger.debug(f"  Timestamp: {slack_timestamp}")
-        logger.debug(f"  Expected: {my_signature}")
-        logger.debug(f"  Received: {slack_signature}")
-        logger.debug(f"  Match: {hmac.compare_digest(my_signature, slack_signature)}")
-        logger.debug(f"  Body length: {len(body)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Slack signature verification: timestamp=%s expected=%s received=%s "
+                "match=%s body_length=%d",
+                slack_timestamp,
+                my_signature,
+                slack_signature,
+                is_valid,
+                len(body),
+            )
 
-        # Compare signatures
-        return hmac.compare_digest(my_signature, slack_signature)
+        return is_valid
 
     async def send_message(
         self,
@@ -175,7 +238,7 @@ class SlackChannelAdapter(
         # Track channel for this message for future updates
         self._message_channels[message_ts] = channel
 
-        logger.info(f"Sent message to Slack: {message_ts}")
+        logger.info("Sent message to Slack: %s", message_ts)
         return message_ts
 
     async def stream_message_chunk(
@@ -191,21 +254,47 @@ class SlackChannelAdapter(
             conversation_id: Associated conversation ID
             message_id: ID of message being updated
         """
-        # Accumulate chunks
-        if message_id not in self._streaming_messages:
-            self._streaming_messages[message_id] = chunk
-        else:
-            self._streaming_messages[message_id] += chunk
+        # Accumulate chunks; they're joined only when an update is sent, at
+        # most once per _STREAM_UPDATE_INTERVAL, by the message's updater task
+        stream = self._streaming_messages.get(message_id)
+        if stream is None:
+            stream = self._streaming_messages[message_id] = _StreamState()
+        stream.parts.append(chunk)
 
         channel = self._get_channel_for_message(message_id)
-        if channel:
-            await self.client.chat_update(
-                channel=channel,
-                ts=message_id,
-                text=self._streaming_messages[message_id],
+        if channel and stream.updater is None:
+            stream.updater = asyncio.create_task(
+                self._update_streamed_message(channel, message_id, stream)
             )
 
-        logger.info(f"Streaming chunk to Slack: {chunk[:50]}...")
+        logger.debug("Streaming chunk to Slack: %.50s...", chunk)
+
+    async def _update_streamed_message(
+        self, channel: str, message_id: str, stream: _StreamState
+    ) -> None:
+        """Update a streamed message until it shows every chunk received.
+
+        Chunks that arrive while waiting or while an update is in flight are
+        picked up by the next update, so the last update always carries the
+        full text even though the adapter is never told the stream ended.
+        """
+        while True:
+            delay = stream.last_update + _STREAM_UPDATE_INTERVAL - _monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            sent_parts = len(stream.parts)
+            try:
+                await self.client.chat_update(
+                    channel=channel, ts=message_id, text="".join(stream.parts)
+                )
+            except Exception as e:
+                logger.warning("Failed to update streamed Slack message %s: %s", message_id, e)
+            stream.last_update = _monotonic()
+
+            if len(stream.parts) == sent_parts:
+                stream.updater = None
+                return
 
     async def send_rich_message(
         self,
@@ -241,7 +330,7 @@ class SlackChannelAdapter(
         message_ts = response["ts"]
         self._message_channels[message_ts] = channel
 
-        logger.info(f"Sent rich message to Slack with {len(blocks)} blocks")
+        logger.info("Sent rich message to Slack with %d blocks", len(blocks))
         return message_ts
 
     async def send_interactive_message(
@@ -266,10 +355,7 @@ class SlackChannelAdapter(
             raise ValueError("Slack metadata required")
 
         blocks = [
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": content.text},
-            },
+            _section_block(content.text),
             {
                 "type": "actions",
                 "elements": [
@@ -295,7 +381,7 @@ class SlackChannelAdapter(
         message_ts = response["ts"]
         self._message_channels[message_ts] = channel
 
-        logger.info(f"Sent interactive message to Slack with {len(content.buttons)} buttons")
+        logger.info("Sent interactive message to Slack with %d buttons", len(content.buttons))
         return message_ts
 
     async def handle_interaction(self, interaction_event: dict) -> InteractionResponse:
@@ -339,7 +425,7 @@ class SlackChannelAdapter(
                 name=reaction,
             )
 
-        logger.info(f"Added reaction :{reaction}: to message {message_id}")
+        logger.info("Added reaction :%s: to message %s", reaction, message_id)
 
     async def remove_reaction(
         self,
@@ -360,7 +446,7 @@ class SlackChannelAdapter(
                 name=reaction,
             )
 
-        logger.info(f"Removed reaction :{reaction}: from message {message_id}")
+        logger.info("Removed reaction :%s: from message %s", reaction, message_id)
 
     async def store_conversation_mapping(
         self,
@@ -376,7 +462,7 @@ class SlackChannelAdapter(
             metadata: Slack-specific metadata (channel, etc.)
         """
         self._conversation_mappings[thread_id] = conversation_id
-        logger.info(f"Stored conversation mapping: {thread_id} -> {conversation_id}")
+        logger.info("Stored conversation mapping: %s -> %s", thread_id, conversation_id)
 
     async def get_conversation_mapping(self, thread_id: str) -> UUID | None:
         """Retrieve conversation ID by Slack thread ID.
@@ -388,36 +474,42 @@ class SlackChannelAdapter(
             Associated conversation ID or None if not found
         """
         conversation_id = self._conversation_mappings.get(thread_id)
-        logger.info(f"Retrieved conversation mapping: {thread_id} -> {conversation_id}")
+        logger.info("Retrieved conversation mapping: %s -> %s", thread_id, conversation_id)
         return conversation_id
 
     # Helper methods
-    def _parse_app_mention(self, event_data: dict) -> ReceivedMessage:
+    def _parse_app_mention(self, event_data: dict, bot_user_id: str | None) -> ReceivedMessage:
         """Parse app_mention event."""
+        get = event_data.get
+        ts = get("ts", "")
+        thread_ts = get("thread_ts")
         return ReceivedMessage(
-            content=event_data.get("text", "").replace("<@BOT_ID>", "").strip(),
-            sender_id=event_data.get("user", ""),
+            content=_strip_bot_mention(get("text", ""), bot_user_id),
+            sender_id=get("user", ""),
             conversation_id=None,  # Will be looked up or created
-            thread_id=event_data.get("thread_ts", event_data.get("ts", "")),
+            thread_id=get("thread_ts", ts),
             metadata={
-                "channel": event_data.get("channel", ""),
-                "ts": event_data.get("ts", ""),
-                "thread_ts": event_data.get("thread_ts"),
+                "channel": get("channel", ""),
+                "ts": ts,
+                "thread_ts": thread_ts,
                 "event_type": "app_mention",
             },
         )
 
-    def _parse_message(self, event_data: dict) -> ReceivedMessage:
+    def _parse_message(self, event_data: dict, bot_user_id: str | None) -> ReceivedMessage:
         """Parse message event."""
+        get = event_data.get
+        ts = get("ts", "")
+        thread_ts = get("thread_ts")
         return ReceivedMessage(
-            content=event_data.get("text", ""),
-            sender_id=event_data.get("user", ""),
+            content=get("text", ""),
+            sender_id=get("user", ""),
             conversation_id=None,
-            thread_id=event_data.get("thread_ts", event_data.get("ts", "")),
+            thread_id=get("thread_ts", ts),
             metadata={
-                "channel": event_data.get("channel", ""),
-                "ts": event_data.get("ts", ""),
-                "thread_ts": event_data.get("thread_ts"),
+                "channel": get("channel", ""),
+                "ts": ts,
+                "thread_ts": thread_ts,
                 "event_type": "message",
             },
         )
@@ -425,25 +517,37 @@ class SlackChannelAdapter(
     def _convert_to_blocks(self, content: RichMessage) -> list[dict]:
         """Convert RichMessage to Slack Block Kit format."""
         # Simple conversion - in reality, this would be more sophisticated
-        blocks = [
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": content.text},
-            }
-        ]
-        return blocks
+        return [_section_block(content.text)]
 
     def _extract_conversation_id(self, interaction_event: dict) -> UUID:
         """Extract conversation ID from interaction event.
 
-        In a real implementation, this would look up the conversation ID
-        from the thread_ts stored in metadata.
-        """
-        # For now, return a placeholder
-        from uuid import uuid4
+        Looks up the thread of the message the interaction happened on in the
+        in-memory thread -> conversation mappings.
 
-        return uuid4()
+        Returns:
+            Mapped conversation ID, or a nil UUID placeholder if the thread is unknown
+        """
+        container = interaction_event.get("container") or {}
+        message = interaction_event.get("message") or {}
+        thread_ts = (
+            container.get("thread_ts")
+            or message.get("thread_ts")
+            or container.get("message_ts")
+            or message.get("ts")
+        )
+        if thread_ts:
+            conversation_id = self._conversation_mappings.get(thread_ts)
+            if conversation_id is not None:
+                return conversation_id
+        return _UNKNOWN_CONVERSATION_ID
 
     def _get_channel_for_message(self, message_id: str) -> str | None:
         """Get channel ID for a message (used when updating)."""
         return self._message_channels.get(message_id)
+
+    # Inner event type -> parser, used by receive_message
+    _EVENT_PARSERS: ClassVar[dict[str, Callable[..., ReceivedMessage]]] = {
+        "app_mention": _parse_app_mention,
+        "message": _parse_message,
+    }
@@ -2,12 +2,15 @@
 
 import logging
 from typing import cast
+from urllib.parse import parse_qs
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic_core import from_json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.base import InteractiveCapable, ReactionCapable
 from app.adapters.email import EmailChannelAdapter
+from app.api.responses import json_response
 from app.config import get_settings
 from app.database import get_db
 from app.services.channel_adapter_manager import ChannelAdapterManager, SecurityError
@@ -20,6 +23,15 @@ router = APIRouter(prefix="/channel-adapters", tags=["channel-adapters"])
 
 settings = get_settings()
 
+# Settings are fixed for the process lifetime, so resolve this once
+_MAILGUN_ENABLED = bool(settings.mailgun_api_key and settings.mailgun_domain)
+
+# Slack's url_verification handshake is well under this size
+_MAX_URL_VERIFICATION_BYTES = 512
+
+# Slack interaction bodies carry a single "payload" form field
+_MAX_INTERACTION_FORM_FIELDS = 4
+
 # Global channel adapter manager instance
 _channel_manager: ChannelAdapterManager | None = None
 
@@ -34,7 +46,7 @@ def get_channel_manager() -> ChannelAdapterManager:
 
 async def initialize_email_adapter() -> None:
     """Initialize and register the email adapter."""
-    if not settings.mailgun_api_key or not settings.mailgun_domain:
+    if not _MAILGUN_ENABLED:
         logger.warning("Mailgun not configured - email adapter will not be available")
         return
 
@@ -42,6 +54,7 @@ async def initialize_email_adapter() -> None:
     adapter = EmailChannelAdapter(
         mailgun_api_key=settings.mailgun_api_key,
         mailgun_domain=settings.mailgun_domain,
+        from_email=settings.mailgun_from_email,
     )
     await manager.register_adapter("email", adapter)
     logger.info("Email adapter (Mailgun) registered")
@@ -51,7 +64,7 @@ async def initialize_email_adapter() -> None:
 async def email_webhook(
     request: Request,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> Response:
     """Receive incoming email webhook from Mailgun.
 
     Mailgun sends incoming emails to this endpoint when configured
@@ -67,7 +80,7 @@ async def email_webhook(
     Raises:
         HTTPException: If Mailgun not configured (returns 503)
     """
-    if not settings.mailgun_api_key or not settings.mailgun_domain:
+    if not _MAILGUN_ENABLED:
         logger.error("Mailgun not configured (missing API key or domain)")
         raise HTTPException(status_code=503, detail="Email service not configured")
 
@@ -91,26 +104,28 @@ async def email_webhook(
         await db.commit()
         logger.info(f"Successfully processed email {message_id} to conversation {conversation_id}")
 
-        return {"status": "ok", "message_id": message_id, "conversation_id": str(conversation_id)}
+        return json_response(
+            {"status": "ok", "message_id": message_id, "conversation_id": str(conversation_id)}
+        )
 
     except SecurityError as e:
         logger.warning(f"Security error processing email {message_id}: {e}")
         # Return 200 anyway to prevent Mailgun retries
         # but log the security issue
-        return {"status": "error", "message": "signature verification failed"}
+        return json_response({"status": "error", "message": "signature verification failed"})
 
     except Exception as e:
         logger.error(f"Error processing email {message_id}: {e}", exc_info=True)
         # Return 200 to acknowledge receipt and prevent Mailgun retries
         # The error is logged for investigation
-        return {"status": "error", "message": str(e)}
+        return json_response({"status": "error", "message": str(e)})
 
 
 @router.post("/slack/events")
 async def slack_events(
     request: Request,
     db: AsyncSession = Depends(get_db),
-):
+) -> Response:
     """Handle incoming Slack events (app_mention, message, etc.).
 
     Args:
@@ -120,31 +135,36 @@ async def slack_events(
     Returns:
         Slack API response
     """
-    # Parse request body
-    body = await request.json()
+    # Read the raw body once; it is needed as-is for signature verification
+    raw_body = await request.body()
 
-    # Handle Slack URL verification challenge
-    if body.get("type") == "url_verification":
-        return {"challenge": body.get("challenge")}
+    # Handle Slack URL verification challenge. The handshake body is tiny and
+    # only echoes a value back, so answer it before the adapter lookup and
+    # signature check; Slack times this request out quickly.
+    if len(raw_body) <= _MAX_URL_VERIFICATION_BYTES and b'"url_verification"' in raw_body:
+        try:
+            challenge_body = from_json(raw_body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="Invalid JSON body") from e
+        if challenge_body.get("type") == "url_verification":
+            return json_response({"challenge": challenge_body.get("challenge")})
 
     # Get the Slack adapter
-    manager = ChannelAdapterManager(db)
+    manager = get_channel_manager()
     try:
         adapter = manager.get_adapter("slack")
     except KeyError:
         raise HTTPException(status_code=500, detail="Slack adapter not configured") from None
 
     # Get raw request data for signature verification
-    raw_body = await request.body()
-    headers = dict(request.headers)
-
-    # Log headers for debugging
-    logger.debug(f"Slack request headers: {list(headers.keys())}")
-    logger.debug(f"Timestamp header value: {headers.get('x-slack-request-timestamp', 'NOT FOUND')}")
-
-    request_data = {"headers": headers, "body": raw_body.decode("utf-8")}
-
-    # Verify Slack request signature
+    request_data = {
+        "signature": request.headers.get("x-slack-signature", ""),
+        "timestamp": request.headers.get("x-slack-request-timestamp", ""),
+        "body": raw_body,
+    }
+    logger.debug(f"Timestamp header value: {request_data['timestamp'] or 'NOT FOUND'}")
+
+    # Verify Slack request signature before doing any parsing work
     is_valid = await adapter.verify_request(request_data)
     logger.debug(f"Slack signature verification result: {is_valid}")
     if not is_valid:
@@ -152,6 +172,12 @@ async def slack_events(
 
     logger.info(f"Slack event verified and accepted")
 
+    # Parse request body
+    try:
+        body = from_json(raw_body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid JSON body") from e
+
     # Handle the incoming event
     try:
         conversation_manager = ConversationManager(db)
@@ -175,7 +201,9 @@ async def slack_events(
         await enqueue_conversation_processing(conversation_id)
         logger.info(f"Queued conversation {conversation_id} for processing")
 
-        return {"ok": True, "conversation_id": str(conversation_id), "thread_id": thread_id}
+        return json_response(
+            {"ok": True, "conversation_id": str(conversation_id), "thread_id": thread_id}
+        )
     except ValueError as e:
         logger.error(f"ValueError handling Slack event: {e}")
         raise HTTPException(status_code=400, detail=str(e)) from e
@@ -188,7 +216,7 @@ async def slack_events(
 async def slack_interactions(
     request: Request,
     db: AsyncSession = Depends(get_db),
-):
+) -> Response:
     """Handle Slack interactive events (button clicks, menu selections, etc.).
 
     Args:
@@ -198,27 +226,8 @@ async def slack_interactions(
     Returns:
         Slack API response
     """
-    import json
-
-    # Parse form data
-    form = await request.form()
-    payload_str = form.get("payload", "{}")
-
-    # Handle case where payload might be UploadFile
-    if isinstance(payload_str, str):
-        payload_str_decoded = payload_str
-    else:
-        payload_str_decoded = await payload_str.read()
-        payload_str_decoded = payload_str_decoded.decode("utf-8")
-
-    # Parse JSON payload
-    try:
-        payload = json.loads(payload_str_decoded)
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=400, detail="Invalid JSON in payload") from e
-
     # Get the Slack adapter
-    manager = ChannelAdapterManager(db)
+    manager = get_channel_manager()
     try:
         adapter = manager.get_adapter("slack")
     except KeyError:
@@ -226,15 +235,31 @@ async def slack_interactions(
 
     # Get raw request data for signature verification
     raw_body = await request.body()
-    headers = dict(request.headers)
-
-    request_data = {"headers": headers, "body": raw_body.decode("utf-8")}
+    request_data = {
+        "signature": request.headers.get("x-slack-signature", ""),
+        "timestamp": request.headers.get("x-slack-request-timestamp", ""),
+        "body": raw_body,
+    }
 
-    # Verify Slack request signature
+    # Verify Slack request signature before doing any parsing work
     is_valid = await adapter.verify_request(request_data)
     if not is_valid:
         raise HTTPException(status_code=401, detail="Invalid Slack signature")
 
+    # Parse form data. Slack always sends interactions urlencoded with a
+    # single "payload" field, so skip Starlette's form parser.
+    try:
+        form = parse_qs(raw_body, max_num_fields=_MAX_INTERACTION_FORM_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid form body") from e
+    payload_bytes = form.get(b"payload", [b"{}"])[0]
+
+    # Parse JSON payload
+    try:
+        payload = from_json(payload_bytes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid JSON in payload") from e
+
     # Handle interaction
     try:
         # Check if adapter supports interactions
@@ -254,6 +279,6 @@ async def slack_interactions(
             db_session=db,
         )
 
-        return {"ok": True, "action_id": interaction_response.action_id}
+        return json_response({"ok": True, "action_id": interaction_response.action_id})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
@@ -1,174 +1,291 @@
 """API endpoints for conversation management."""
 
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
-from app.config import create_agent_runner
-from app.database import get_db
+from app.api.responses import json_response
+from app.config import get_agent_runner
+from app.database import get_db, get_db_readonly
 from app.models.domain import (
     ConversationThread,
     CreateConversationRequest,
-    Message,
+    MessagePage,
     SendMessageRequest,
 )
+from app.runners.base import AgentRunner
 from app.services.agent_executor import AgentExecutor
-from app.services.conversation_manager import ConversationManager
+from app.services.conversation_manager import ConversationManager, ConversationNotFoundError
+from app.services.response_cache import get_response_cache
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
 
+def get_conversation_manager(db: AsyncSession = Depends(get_db)) -> ConversationManager:
+    """Provide a ConversationManager bound to the request's database session."""
+    return ConversationManager(db)
+
+
+def get_readonly_conversation_manager(
+    db: AsyncSession = Depends(get_db_readonly),
+) -> ConversationManager:
+    """Provide a ConversationManager bound to a read-only database session."""
+    return ConversationManager(db)
+
+
+async def get_runner() -> AgentRunner:
+    """Provide the shared agent runner.
+
+    Async so FastAPI calls it inline instead of dispatching the cached lookup
+    to the threadpool.
+    """
+    return get_agent_runner()
+
+
+# Streamed responses are flushed once this many characters are buffered, or once
+# the oldest buffered chunk has waited this long, whichever comes first.
+_STREAM_FLUSH_CHARS = 4096
+_STREAM_FLUSH_INTERVAL = 0.05
+
+
+async def _coalesce_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Merge small streamed chunks into larger frames.
+
+    Agents often emit one token per chunk, and every chunk becomes its own ASGI
+    send. The source is drained by a separate task into a queue so that a
+    flush timeout never cancels the underlying generator mid-step.
+
+    Args:
+        chunks: Source chunk iterator
+
+    Yields:
+        Coalesced chunks of up to roughly _STREAM_FLUSH_CHARS characters
+    """
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for chunk in chunks:
+                queue.put_nowait(chunk)
+        finally:
+            queue.put_nowait(None)
+
+    loop = asyncio.get_running_loop()
+    task = asyncio.create_task(pump())
+    buffer: list[str] = []
+    size = 0
+    deadline: float | None = None
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                chunk = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                chunk = ""
+            else:
+                if chunk is None:
+                    break
+                if not buffer:
+                    deadline = loop.time() + _STREAM_FLUSH_INTERVAL
+                buffer.append(chunk)
+                size += len(chunk)
+                if size < _STREAM_FLUSH_CHARS:
+                    continue
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+            deadline = None
+
+        if buffer:
+            yield "".join(buffer)
+        # Re-raise any error from the source
+        await task
+    finally:
+        task.cancel()
+
+
+async def _start_stream(stream: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Advance a stream to its first chunk and return an iterator over all of it.
+
+    Errors raised before the first chunk, such as a missing conversation,
+    propagate from this call while the endpoint can still turn them into an
+    HTTP error response.
+
+    Args:
+        stream: Source chunk iterator
+
+    Returns:
+        Iterator yielding the first chunk followed by the rest of the stream
+    """
+    try:
+        first = await anext(stream)
+    except StopAsyncIteration:
+        return stream
+
+    async def resume() -> AsyncIterator[str]:
+        yield first
+        async for chunk in stream:
+            yield chunk
+
+    return resume()
+
+
 @router.post("", response_model=ConversationThread)
 async def create_conversation(
     request: CreateConversationRequest,
     user_id: str = "default_user",  # In production, get from auth
-    db: AsyncSession = Depends(get_db),
-) -> ConversationThread:
+    manager: ConversationManager = Depends(get_conversation_manager),
+) -> Response:
     """Create a new conversation thread.
 
     Args:
         request: Conversation creation request
         user_id: User identifier (from authentication)
-        db: Database session
+        manager: Conversation manager
 
     Returns:
-        Created conversation thread
+        JSON of the created conversation thread
     """
-    manager = ConversationManager(db)
     conversation = await manager.create_conversation(
         user_id=user_id,
         pattern_type=request.pattern_type,
         context_data=request.context_data,
     )
-    return conversation
+    return json_response(conversation)
 
 
 @router.get("/{conversation_id}", response_model=ConversationThread)
 async def get_conversation(
     conversation_id: UUID,
     load_messages: bool = False,
-    db: AsyncSession = Depends(get_db),
-) -> ConversationThread:
+    manager: ConversationManager = Depends(get_readonly_conversation_manager),
+) -> Response:
     """Get a conversation by ID.
 
     Args:
         conversation_id: Conversation identifier
         load_messages: Whether to load message history
-        db: Database session
+        manager: Conversation manager
 
     Returns:
-        Conversation thread
+        JSON of the conversation thread
 
     Raises:
         HTTPException: If conversation not found
     """
-    manager = ConversationManager(db)
     conversation = await manager.get_conversation(conversation_id, load_messages=load_messages)
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    return conversation
+    return json_response(conversation)
 
 
-@router.get("/{conversation_id}/messages", response_model=list[Message])
+@router.get("/{conversation_id}/messages", response_model=MessagePage)
 async def get_messages(
     conversation_id: UUID,
-    limit: int | None = None,
-    offset: int = 0,
-    db: AsyncSession = Depends(get_db),
-) -> list[Message]:
-    """Get messages for a conversation.
+    limit: int = Query(default=50, ge=1, le=500),
+    before: datetime | None = None,
+    before_id: UUID | None = None,
+    manager: ConversationManager = Depends(get_readonly_conversation_manager),
+) -> Response:
+    """Get a page of messages for a conversation.
+
+    Pages run from the newest messages backwards; pass the returned
+    next_cursor and next_cursor_id as `before` and `before_id` to fetch the
+    next older page.
 
     Args:
         conversation_id: Conversation identifier
-        limit: Optional limit on number of messages
-        offset: Offset for pagination
-        db: Database session
+        limit: Maximum number of messages to return
+        before: Cursor timestamp from a previous page's next_cursor
+        before_id: Cursor id from a previous page's next_cursor_id
+        manager: Conversation manager
 
     Returns:
-        List of messages
+        JSON page of messages in chronological order
     """
-    manager = ConversationManager(db)
-    messages = await manager.get_messages(conversation_id, limit=limit, offset=offset)
-    return messages
+    page = await manager.get_message_page(
+        conversation_id, limit=limit, before=before, before_id=before_id
+    )
+    return json_response(page)
 
 
 @router.post("/{conversation_id}/messages")
 async def send_message(
     conversation_id: UUID,
     request: SendMessageRequest,
-    db: AsyncSession = Depends(get_db),
+    manager: ConversationManager = Depends(get_conversation_manager),
+    runner: AgentRunner = Depends(get_runner),
 ):
     """Send a message and get agent response.
 
     Args:
         conversation_id: Conversation identifier
         request: Message request
-        db: Database session
+        manager: Conversation manager
+        runner: Shared agent runner
 
     Returns:
         Agent response (streaming if requested, otherwise JSON)
     """
-    manager = ConversationManager(db)
-
-    # Check if conversation exists
-    conversation = await manager.get_conversation(conversation_id)
-    if not conversation:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-
-    # Create runner and executor
-    runner = create_agent_runner()
-    executor = AgentExecutor(runner, manager)
+    # Create executor around the shared runner. The executor's first step adds
+    # the user message, which raises if the conversation does not exist.
+    executor = AgentExecutor(runner, manager, response_cache=get_response_cache())
+    stream = executor.execute_sync(
+        conversation_id=conversation_id,
+        user_message=request.message,
+    )
 
-    if request.stream:
-        # Streaming response
+    # The assistant response is saved in the background as the stream ends;
+    # wait for it after the response is sent, while the session is still open
+    finish = BackgroundTask(executor.aclose)
 
-        async def generate():
-            async for chunk in executor.execute_sync(
-                conversation_id=conversation_id,
-                user_message=request.message,
-            ):
-                yield chunk
+    try:
+        if request.stream:
+            # Streaming response
+            stream = await _start_stream(stream)
+            return StreamingResponse(
+                _coalesce_chunks(stream), media_type="text/plain", background=finish
+            )
 
-        return StreamingResponse(generate(), media_type="text/plain")
-    else:
         # Non-streaming response
-        response_text = ""
-        async for chunk in executor.execute_sync(
-            conversation_id=conversation_id,
-            user_message=request.message,
-        ):
-            response_text += chunk
+        parts: list[str] = []
+        async for chunk in stream:
+            parts.append(chunk)
+    except ConversationNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Conversation not found") from e
 
-        return {"message": response_text}
+    return json_response({"message": "".join(parts)}, background=finish)
 
 
 @router.post("/{conversation_id}/continue", response_model=ConversationThread)
 async def continue_conversation(
     conversation_id: UUID,
     request: SendMessageRequest,
-    db: AsyncSession = Depends(get_db),
-) -> ConversationThread:
+    manager: ConversationManager = Depends(get_conversation_manager),
+) -> Response:
     """Continue a conversation with a follow-up message.
 
     Args:
         conversation_id: Conversation identifier
         request: Message request
-        db: Database session
+        manager: Conversation manager
 
     Returns:
-        Updated conversation thread
+        JSON of the updated conversation thread
 
     Raises:
         HTTPException: If conversation not found
     """
-    manager = ConversationManager(db)
-
     try:
         conversation = await manager.continue_thread(conversation_id, request.message)
-        return conversation
+        return json_response(conversation)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -0,0 +1,50 @@
+"""Fast JSON response helpers for API endpoints."""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+
+
+def json_response(
+    content: Any, status_code: int = 200, background: BackgroundTask | None = None
+) -> Response:
+    """Serialize content straight to JSON bytes and wrap it in a Response.
+
+    Returning a Response skips FastAPI's jsonable_encoder pass and stdlib
+    json.dumps; pydantic_core encodes dicts, lists, UUIDs, datetimes and
+    Pydantic models natively.
+
+    Args:
+        content: JSON-serializable content
+        status_code: HTTP status code
+        background: Optional task to run after the response is sent
+
+    Returns:
+        Response with application/json media type
+    """
+    return Response(
+        content=to_json(content),
+        status_code=status_code,
+        media_type="application/json",
+        background=background,
+    )
+
+
+def list_response(adapter: TypeAdapter[Any], items: list[Any]) -> Response:
+    """Serialize a list of models with a prebuilt TypeAdapter.
+
+    Used by list endpoints: the route keeps its response_model for the OpenAPI
+    schema, but returning a Response directly skips FastAPI's per-item
+    re-validation and encodes the whole list in a single dump_json call.
+
+    Args:
+        adapter: TypeAdapter for the list type, built once at import
+        items: Models to serialize
+
+    Returns:
+        Response with application/json media type
+    """
+    return Response(content=adapter.dump_json(items), media_type="application/json")
@@ -2,38 +2,54 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.api.responses import json_response, list_response
+from app.database import get_db, get_db_readonly
 from app.models.domain import (
     CreateTaskRequest,
     Task,
+    TaskSummary,
     TaskType,
     UpdateTaskRequest,
 )
 from app.services.task_manager import TaskManager
+from app.workers.task_worker import enqueue_task
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+_TASK_LIST_ADAPTER = TypeAdapter(list[Task])
+_TASK_SUMMARY_LIST_ADAPTER = TypeAdapter(list[TaskSummary])
+
+
+def get_task_manager(db: AsyncSession = Depends(get_db)) -> TaskManager:
+    """Provide a TaskManager bound to the request's database session."""
+    return TaskManager(db)
+
+
+def get_readonly_task_manager(db: AsyncSession = Depends(get_db_readonly)) -> TaskManager:
+    """Provide a TaskManager bound to a read-only database session."""
+    return TaskManager(db)
+
 
 @router.post("", response_model=Task)
 async def create_task(
     request: CreateTaskRequest,
     user_id: str = "default_user",  # In production, get from auth
-    db: AsyncSession = Depends(get_db),
-) -> Task:
+    manager: TaskManager = Depends(get_task_manager),
+) -> Response:
     """Create a new task.
 
     Args:
         request: Task creation request
         user_id: User identifier (from authentication)
-        db: Database session
+        manager: Task manager
 
     Returns:
-        Created task
+        JSON of the created task
     """
-    manager = TaskManager(db)
     task = await manager.create_task(
         user_id=user_id,
         task_type=request.task_type,
@@ -42,79 +58,86 @@ async def create_task(
         trigger_config=request.trigger_config,
         notification_config=request.notification_config,
     )
-    return task
+    return json_response(task)
 
 
-@router.get("", response_model=list[Task])
+@router.get("", response_model=list[Task] | list[TaskSummary])
 async def list_tasks(
     task_type: TaskType | None = None,
     is_active: bool | None = None,
+    summary: bool = False,
     user_id: str = "default_user",  # In production, get from auth
-    db: AsyncSession = Depends(get_db),
-) -> list[Task]:
+    manager: TaskManager = Depends(get_readonly_task_manager),
+) -> Response:
     """List all tasks for the current user.
 
+    With summary=true, agent, trigger and notification configuration is left
+    out and each entry is a TaskSummary.
+
     Args:
         task_type: Optional filter by task type
         is_active: Optional filter by active status
+        summary: Whether to list task summaries instead of full tasks
         user_id: User identifier (from authentication)
-        db: Database session
+        manager: Task manager
 
     Returns:
-        List of tasks
+        JSON list of tasks or task summaries
     """
-    manager = TaskManager(db)
+    if summary:
+        summaries = await manager.list_user_task_summaries(
+            user_id, task_type=task_type, is_active=is_active
+        )
+        return list_response(_TASK_SUMMARY_LIST_ADAPTER, summaries)
+
     tasks = await manager.list_user_tasks(user_id, task_type=task_type, is_active=is_active)
-    return tasks
+    return list_response(_TASK_LIST_ADAPTER, tasks)
 
 
 @router.get("/{task_id}", response_model=Task)
 async def get_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
-) -> Task:
+    manager: TaskManager = Depends(get_readonly_task_manager),
+) -> Response:
     """Get task details by ID.
 
     Args:
         task_id: Task identifier
-        db: Database session
+        manager: Task manager
 
     Returns:
-        Task details
+        JSON of the task details
 
     Raises:
         HTTPException: If task not found
     """
-    manager = TaskManager(db)
     task = await manager.get_task(task_id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return task
+    return json_response(task)
 
 
 @router.patch("/{task_id}", response_model=Task)
 async def update_task(
     task_id: UUID,
     request: UpdateTaskRequest,
-    db: AsyncSession = Depends(get_db),
-) -> Task:
+    manager: TaskManager = Depends(get_task_manager),
+) -> Response:
     """Update task configuration.
 
     Args:
         task_id: Task identifier
         request: Update request
-        db: Database session
+        manager: Task manager
 
     Returns:
-        Updated task
+        JSON of the updated task
 
     Raises:
         HTTPException: If task not found
     """
-    manager = TaskManager(db)
-
     try:
         task = await manager.update_task(
             task_id=task_id,
@@ -123,7 +146,7 @@ async def update_task(
             is_active=request.is_active,
             notification_config=request.notification_config,
         )
-        return task
+        return json_response(task)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
 
@@ -131,13 +154,13 @@ async def update_task(
 @router.delete("/{task_id}")
 async def delete_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    manager: TaskManager = Depends(get_task_manager),
 ):
     """Delete a task.
 
     Args:
         task_id: Task identifier
-        db: Database session
+        manager: Task manager
 
     Returns:
         Success message
@@ -145,8 +168,6 @@ async def delete_task(
     Raises:
         HTTPException: If task not found
     """
-    manager = TaskManager(db)
-
     try:
         await manager.delete_task(task_id)
         return {"message": "Task deleted successfully"}
@@ -154,24 +175,39 @@ async def delete_task(
         raise HTTPException(status_code=404, detail=str(e)) from e
 
 
+async def _enqueue_active_task(manager: TaskManager, task_id: UUID) -> None:
+    """Queue a task on the ARQ worker after checking it exists and is active.
+
+    Raises:
+        HTTPException: 404 if the task is not found, 409 if it is disabled
+    """
+    task = await manager.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    if not task.is_active:
+        raise HTTPException(status_code=409, detail=f"Task {task_id} is disabled")
+    await enqueue_task(task_id)
+
+
 @router.post("/{task_id}/execute")
 async def execute_task_now(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    manager: TaskManager = Depends(get_readonly_task_manager),
 ):
     """Manually trigger task execution (for testing).
 
     Args:
         task_id: Task identifier
-        db: Database session
+        manager: Task manager
 
     Returns:
         Success message
-    """
-    manager = TaskManager(db)
 
-    # Execute task in background (in production, this would queue the task)
-    await manager.execute_task(task_id)
+    Raises:
+        HTTPException: If task not found or disabled
+    """
+    # Queue on the ARQ worker so the request doesn't wait on the agent
+    await _enqueue_active_task(manager, task_id)
 
     return {"message": "Task execution started"}
 
@@ -179,13 +215,13 @@ async def execute_task_now(
 @router.post("/{task_id}/disable")
 async def disable_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    manager: TaskManager = Depends(get_task_manager),
 ):
     """Disable a scheduled or triggered task.
 
     Args:
         task_id: Task identifier
-        db: Database session
+        manager: Task manager
 
     Returns:
         Success message
@@ -193,8 +229,6 @@ async def disable_task(
     Raises:
         HTTPException: If task not found
     """
-    manager = TaskManager(db)
-
     try:
         await manager.disable_task(task_id)
         return {"message": "Task disabled successfully"}
@@ -207,22 +241,22 @@ async def disable_task(
 async def webhook_trigger(
     task_id: UUID,
     payload: dict,
-    db: AsyncSession = Depends(get_db),
+    manager: TaskManager = Depends(get_readonly_task_manager),
 ):
     """Receive webhook to trigger event-driven task.
 
     Args:
         task_id: Task identifier
         payload: Webhook payload
-        db: Database session
+        manager: Task manager
 
     Returns:
         Success message
-    """
-    manager = TaskManager(db)
 
-    # Execute task with webhook payload as context
-    # In production, this would queue the task
-    await manager.execute_task(task_id)
+    Raises:
+        HTTPException: If task not found or disabled
+    """
+    # Queue on the ARQ worker so the webhook returns without waiting on the agent
+    await _enqueue_active_task(manager, task_id)
 
     return {"message": "Webhook received and task queued"}
@@ -1,6 +1,12 @@
 """Database models and connection."""
 
-from app.database.connection import AsyncSessionLocal, close_db, get_db, init_db
+from app.database.connection import (
+    AsyncSessionLocal,
+    close_db,
+    get_db,
+    get_db_readonly,
+    init_db,
+)
 from app.database.models import Base, ConversationDB, MessageDB, TaskDB
 
 __all__ = [
@@ -11,5 +17,6 @@ __all__ = [
     "TaskDB",
     "close_db",
     "get_db",
+    "get_db_readonly",
     "init_db",
 ]
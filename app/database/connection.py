@@ -12,9 +12,10 @@ settings = get_settings()
 engine = create_async_engine(
     settings.database_url,
     echo=settings.database_echo,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_pre_ping=settings.database_pool_pre_ping,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_recycle=settings.database_pool_recycle,
 )
 
 # Create async session factory
@@ -36,6 +37,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_db_readonly() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for database sessions used only for reads.
+
+    The session's transaction is started READ ONLY, so PostgreSQL can skip
+    write bookkeeping for it. The setting is reset when the connection goes
+    back to the pool.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.connection(execution_options={"postgresql_readonly": True})
+            yield session
+        finally:
+            await session.close()
+
+
 async def init_db() -> None:
     """Initialize database (create tables if they don't exist)."""
     from app.database.models import Base
@@ -1,19 +1,20 @@
 """SQLAlchemy ORM models for database persistence."""
 
 from datetime import UTC, datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from sqlalchemy import (
-    JSON,
     Boolean,
     DateTime,
     Enum,
     ForeignKey,
     Index,
+    Integer,
     String,
     Text,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from app.models.domain import (
@@ -21,6 +22,7 @@ from app.models.domain import (
     MessageRole,
     TaskStatus,
     TaskType,
+    new_uuid,
 )
 
 
@@ -35,7 +37,7 @@ class ConversationDB(Base):
 
     __tablename__ = "conversations"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=new_uuid)
     user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
@@ -47,7 +49,9 @@ class ConversationDB(Base):
         nullable=False,
     )
     status: Mapped[ConversationStatus] = mapped_column(
-        Enum(ConversationStatus), nullable=False, default=ConversationStatus.ACTIVE
+        Enum(ConversationStatus, native_enum=False, length=16),
+        nullable=False,
+        default=ConversationStatus.ACTIVE,
     )
 
     # Pattern identification
@@ -58,14 +62,21 @@ class ConversationDB(Base):
     pattern_type: Mapped[str] = mapped_column(String(50), nullable=False)
 
     # Context and state
-    context_data: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    context_data: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
 
     # Task-specific metadata
     task_id: Mapped[UUID | None] = mapped_column(ForeignKey("tasks.id"), nullable=True)
 
     # Relationships
+    # Messages load in a stable chronological order and only when eagerly requested
+    # (selectinload); the database's ON DELETE CASCADE removes them, so the ORM
+    # doesn't have to load them just to delete a conversation.
     messages: Mapped[list["MessageDB"]] = relationship(
-        back_populates="conversation", cascade="all, delete-orphan"
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        order_by=lambda: (MessageDB.created_at, MessageDB.id),
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
     task: Mapped["TaskDB | None"] = relationship(
         back_populates="conversation", foreign_keys="TaskDB.conversation_id"
@@ -77,19 +88,24 @@ class MessageDB(Base):
 
     __tablename__ = "messages"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=new_uuid)
     conversation_id: Mapped[UUID] = mapped_column(
-        ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False
+    )
+    role: Mapped[MessageRole] = mapped_column(
+        Enum(MessageRole, native_enum=False, length=16), nullable=False
     )
-    role: Mapped[MessageRole] = mapped_column(Enum(MessageRole), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Estimated when the message is stored, so budgeting history never has
+    # to re-measure old content; NULL for rows written before the column
+    token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
     )
 
     # Tool usage tracking
-    tool_calls: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
-    tool_results: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
+    tool_calls: Mapped[list[dict] | None] = mapped_column(JSONB, nullable=True)
+    tool_results: Mapped[list[dict] | None] = mapped_column(JSONB, nullable=True)
 
     # Channel adapter tracking
     adapter_name: Mapped[str | None] = mapped_column(String(50), nullable=True)
@@ -98,32 +114,41 @@ class MessageDB(Base):
     # Relationships
     conversation: Mapped[ConversationDB] = relationship(back_populates="messages")
 
+    # History is always read per conversation in created_at order; this also
+    # serves plain conversation_id lookups
+    __table_args__ = (Index("ix_messages_conversation_created", "conversation_id", "created_at"),)
+
 
 class TaskDB(Base):
     """Database model for tasks (delegated, scheduled, or triggered)."""
 
     __tablename__ = "tasks"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=new_uuid)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False)
     conversation_id: Mapped[UUID] = mapped_column(
         ForeignKey("conversations.id"), nullable=False, unique=True
     )
 
-    task_type: Mapped[TaskType] = mapped_column(Enum(TaskType), nullable=False)
+    task_type: Mapped[TaskType] = mapped_column(
+        Enum(TaskType, native_enum=False, length=16), nullable=False
+    )
     status: Mapped[TaskStatus] = mapped_column(
-        Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING, index=True
+        Enum(TaskStatus, native_enum=False, length=16),
+        nullable=False,
+        default=TaskStatus.PENDING,
+        index=True,
     )
 
     # Task definition
     prompt: Mapped[str] = mapped_column(Text, nullable=False)
-    agent_config: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    agent_config: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
 
     # Scheduling (for scheduled tasks)
     schedule_expression: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     # Event triggers (for triggered tasks)
-    trigger_config: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    trigger_config: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     # Execution tracking
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -132,7 +157,7 @@ class TaskDB(Base):
 
     # Notifications
     notification_channels: Mapped[list[str]] = mapped_column(
-        JSON, nullable=False, default=list
+        JSONB, nullable=False, default=list
     )  # List of NotificationChannel values
     notification_email: Mapped[str | None] = mapped_column(String(255), nullable=True)
     notification_slack_webhook: Mapped[str | None] = mapped_column(String(500), nullable=True)
@@ -159,13 +184,17 @@ class TaskDB(Base):
         back_populates="task", foreign_keys="TaskDB.conversation_id"
     )
 
+    # Matches list_user_tasks filters (user_id, is_active, task_type); the
+    # leading user_id column also serves plain per-user lookups
+    __table_args__ = (Index("ix_tasks_user_active_type", "user_id", "is_active", "task_type"),)
+
 
 class ConversationChannelAdapterDB(Base):
     """Database model tracking which channel adapters a conversation is active in."""
 
     __tablename__ = "conversation_channel_adapters"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=new_uuid)
     conversation_id: Mapped[UUID] = mapped_column(
         ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True
     )
@@ -176,7 +205,7 @@ class ConversationChannelAdapterDB(Base):
         String(500), nullable=False
     )  # Adapter's thread/conversation ID
     adapter_metadata: Mapped[dict] = mapped_column(
-        JSON, nullable=False, default=dict
+        JSONB, nullable=False, default=dict
     )  # Channel-specific data
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
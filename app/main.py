@@ -1,7 +1,10 @@
 """Main FastAPI application for AI Agent Platform."""
 
+import atexit
 import logging
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -9,16 +12,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.channel_adapters import router as channel_adapters_router
 from app.api.conversations import router as conversations_router
 from app.api.tasks import router as tasks_router
-from app.config import get_settings
+from app.config import get_agent_runner, get_settings
 from app.database import close_db, init_db
-from app.services.channel_adapter_manager import initialize_adapters
+from app.services.channel_adapter_manager import close_adapters, initialize_adapters
+from app.services.response_cache import close_response_cache
 from app.workers.scheduler import load_scheduled_tasks, start_scheduler, stop_scheduler
-
-# Configure logging to show DEBUG level logs
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+from app.workers.task_worker import close_arq_pool
+
+# Configure logging to show DEBUG level logs. Records are handed to a queue and
+# written to stderr by a listener thread, so logging on the request path never
+# blocks the event loop on terminal or pipe I/O. force=True replaces handlers
+# installed by modules imported above (e.g. the worker module's basicConfig).
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))  # Listener adds the prefix
+logging.basicConfig(level=logging.DEBUG, handlers=[_queue_handler], force=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -46,6 +59,13 @@ async def lifespan(app: FastAPI):
     await load_scheduled_tasks()
     logger.info("Scheduled tasks loaded")
 
+    # Warm up the shared agent runner so the first request doesn't build it
+    try:
+        get_agent_runner()
+        logger.info("Agent runner initialized")
+    except Exception as e:
+        logger.warning(f"Agent runner warm-up failed, will retry on first use: {e}")
+
     yield
 
     # Shutdown
@@ -55,6 +75,14 @@ async def lifespan(app: FastAPI):
     stop_scheduler()
     logger.info("Scheduler stopped")
 
+    # Close adapter HTTP sessions
+    await close_adapters()
+    logger.info("Channel adapters closed")
+
+    # Close the ARQ enqueue pool and response cache
+    await close_arq_pool()
+    await close_response_cache()
+
     # Close database
     await close_db()
     logger.info("Database closed")
@@ -96,13 +124,3 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "version": settings.app_version}
-
-
-if __name__ == "__main__":
-    import uvicorn
-
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-    )
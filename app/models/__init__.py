@@ -12,6 +12,7 @@ from app.models.domain import (
     SendMessageRequest,
     Task,
     TaskStatus,
+    TaskSummary,
     TaskType,
     UpdateTaskRequest,
 )
@@ -28,6 +29,7 @@ __all__ = [
     "SendMessageRequest",
     "Task",
     "TaskStatus",
+    "TaskSummary",
     "TaskType",
     "UpdateTaskRequest",
 ]
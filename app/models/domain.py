@@ -1,15 +1,54 @@
 """Core domain models using Pydantic."""
 
+import os
+import time
 from datetime import UTC, datetime
 from enum import Enum
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Default timestamps are reused for up to 1 ms, so a burst of model
+# constructions shares one aware datetime. Stored as one tuple so readers never
+# see a half-updated pair.
+_NOW_RESOLUTION = 0.001
+_now_cache: tuple[float, datetime] = (float("-inf"), datetime.now(UTC))
 
 
 def utc_now() -> datetime:
-    """Get current UTC time with timezone awareness."""
-    return datetime.now(UTC)
+    """Get current UTC time with timezone awareness, at 1 ms resolution.
+
+    Only used for domain model defaults. Database timestamps that order
+    messages are still generated per row.
+    """
+    global _now_cache
+    mono = time.monotonic()
+    cached_mono, cached_now = _now_cache
+    if mono - cached_mono < _NOW_RESOLUTION:
+        return cached_now
+    now = datetime.now(UTC)
+    _now_cache = (mono, now)
+    return now
+
+
+# Random v4 UUIDs are generated from one os.urandom read per batch instead of
+# one per ID. The pool is cleared in forked children so they never hand out
+# the parent's IDs.
+_UUID_BATCH_SIZE = 256
+_uuid_pool: list[UUID] = []
+os.register_at_fork(after_in_child=_uuid_pool.clear)
+
+
+def new_uuid() -> UUID:
+    """Get a new random (version 4) UUID."""
+    while True:
+        try:
+            return _uuid_pool.pop()
+        except IndexError:
+            rng = os.urandom(16 * _UUID_BATCH_SIZE)
+            _uuid_pool.extend(
+                UUID(bytes=rng[i : i + 16], version=4) for i in range(0, len(rng), 16)
+            )
 
 
 # Enums
@@ -61,6 +100,8 @@ class NotificationChannel(str, Enum):
 class NotificationConfig(BaseModel):
     """Configuration for task notifications."""
 
+    model_config = ConfigDict(frozen=True)
+
     channels: list[NotificationChannel] = Field(default_factory=list)
     email_address: str | None = None
     slack_webhook_url: str | None = None
@@ -68,9 +109,15 @@ class NotificationConfig(BaseModel):
 
 
 class Message(BaseModel):
-    """Individual message within a conversation."""
+    """Individual message within a conversation.
+
+    Messages are immutable once stored, so instances are frozen and can be
+    shared between history lists, pages and caches without defensive copies.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
-    id: UUID = Field(default_factory=uuid4)
+    id: UUID = Field(default_factory=new_uuid)
     conversation_id: UUID
     role: MessageRole
     content: str
@@ -84,7 +131,7 @@ class Message(BaseModel):
 class ConversationThread(BaseModel):
     """Conversation thread representing any agent interaction."""
 
-    id: UUID = Field(default_factory=uuid4)
+    id: UUID = Field(default_factory=new_uuid)
     user_id: str
     created_at: datetime = Field(default_factory=utc_now)
     updated_at: datetime = Field(default_factory=utc_now)
@@ -102,11 +149,34 @@ class ConversationThread(BaseModel):
     # Task-specific metadata
     task_id: UUID | None = None
 
+    def append_message(self, message: Message) -> None:
+        """Append a message to the loaded history in place.
+
+        Only the new message is touched; the existing history is not copied
+        or re-validated.
+
+        Args:
+            message: Message that was added to this conversation
+        """
+        self.messages.append(message)
+        self.updated_at = message.created_at
+
+
+class MessagePage(BaseModel):
+    """One page of conversation messages for keyset pagination."""
+
+    messages: list[Message] = Field(default_factory=list)  # Oldest first
+
+    # Pass as `before` and `before_id` to fetch the next (older) page; None on
+    # the last page
+    next_cursor: datetime | None = None
+    next_cursor_id: UUID | None = None
+
 
 class Task(BaseModel):
     """Represents delegated, scheduled, or triggered work."""
 
-    id: UUID = Field(default_factory=uuid4)
+    id: UUID = Field(default_factory=new_uuid)
     user_id: str
     conversation_id: UUID
 
@@ -141,6 +211,34 @@ class Task(BaseModel):
     updated_at: datetime = Field(default_factory=utc_now)
 
 
+class TaskSummary(BaseModel):
+    """Task listing entry without agent, trigger and notification configuration."""
+
+    id: UUID
+    user_id: str
+    conversation_id: UUID
+
+    task_type: TaskType
+    status: TaskStatus
+
+    prompt: str
+    schedule_expression: str | None = None
+
+    # Execution tracking
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    error_message: str | None = None
+
+    # State
+    is_active: bool
+    last_run_at: datetime | None = None
+    next_run_at: datetime | None = None
+
+    # Timestamps
+    created_at: datetime
+    updated_at: datetime
+
+
 # Request/Response Models for API
 class CreateConversationRequest(BaseModel):
     """Request to create a new conversation."""
@@ -179,7 +277,7 @@ class UpdateTaskRequest(BaseModel):
 class ConversationChannelAdapter(BaseModel):
     """Tracks which channel adapters a conversation is active in."""
 
-    id: UUID = Field(default_factory=uuid4)
+    id: UUID = Field(default_factory=new_uuid)
     conversation_id: UUID
     adapter_name: str  # "slack", "email", "github"
     thread_id: str  # Adapter's thread/conversation ID
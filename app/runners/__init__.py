@@ -1,4 +1,10 @@
-"""Agent runner adapters for multiple AI frameworks."""
+"""Agent runner adapters for multiple AI frameworks.
+
+Framework-backed runners are imported lazily (PEP 562) so importing the
+package, or any of its lightweight modules, doesn't pull in pydantic_ai.
+"""
+
+from typing import TYPE_CHECKING, Any
 
 from app.runners.base import (
     AgentRunner,
@@ -12,8 +18,10 @@ from app.runners.base import (
     RunnerType,
     ToolCallCapable,
     VisionCapable,
+    is_response_format_capable,
+    is_tool_call_capable,
+    is_vision_capable,
 )
-from app.runners.claude_sdk import ClaudeAgentSDKRunner
 from app.runners.mock import MockRunner
 from app.runners.models import (
     AgentMessage,
@@ -22,8 +30,31 @@ from app.runners.models import (
     MessageRole,
     StreamChunk,
     ToolCall,
+    system_prompt_text,
 )
-from app.runners.pydantic_ai import PydanticAIRunner
+
+if TYPE_CHECKING:
+    from app.runners.claude_sdk import ClaudeAgentSDKRunner
+    from app.runners.pydantic_ai import PydanticAIRunner
+
+_LAZY_RUNNERS = {
+    "ClaudeAgentSDKRunner": "app.runners.claude_sdk",
+    "PydanticAIRunner": "app.runners.pydantic_ai",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import framework-backed runners on first access."""
+    module_name = _LAZY_RUNNERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "AgentMessage",
@@ -46,4 +77,8 @@ __all__ = [
     "ToolCall",
     "ToolCallCapable",
     "VisionCapable",
+    "is_response_format_capable",
+    "is_tool_call_capable",
+    "is_vision_capable",
+    "system_prompt_text",
 ]
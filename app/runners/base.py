@@ -5,7 +5,7 @@ from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Protocol
 
 from app.runners.models import (
     AgentMessage,
@@ -24,9 +24,13 @@ class RunnerType(str, Enum):
     LANGCHAIN = "langchain"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RunnerCapabilities:
-    """Declares what features this runner supports."""
+    """Declares what features this runner supports.
+
+    Instances are immutable, so runners build them once at import and share
+    them between all runner instances.
+    """
 
     supports_streaming: bool = True
     supports_tool_use: bool = False
@@ -36,6 +40,8 @@ class RunnerCapabilities:
     max_output_tokens: int | None = None
     supports_conversation_history: bool = True
     supports_async_execution: bool = True
+    # Honors cache_control markers on system prompt blocks
+    supports_prompt_caching: bool = False
 
 
 # Exception Hierarchy
@@ -70,7 +76,10 @@ class RunnerConfigurationError(RunnerError):
 
 
 # Optional Capability Protocols
-@runtime_checkable
+#
+# These are for static typing only. At runtime, use the is_*_capable()
+# helpers below: a single attribute probe instead of the per-member scan that
+# isinstance() does against a runtime-checkable Protocol.
 class ToolCallCapable(Protocol):
     """Runner can execute tool calls."""
 
@@ -83,7 +92,6 @@ class ToolCallCapable(Protocol):
         ...
 
 
-@runtime_checkable
 class VisionCapable(Protocol):
     """Runner can process images."""
 
@@ -97,7 +105,6 @@ class VisionCapable(Protocol):
         ...
 
 
-@runtime_checkable
 class ResponseFormatCapable(Protocol):
     """Runner can enforce structured output formats."""
 
@@ -106,6 +113,21 @@ class ResponseFormatCapable(Protocol):
         ...
 
 
+def is_tool_call_capable(runner: object) -> bool:
+    """Check whether a runner implements ToolCallCapable."""
+    return hasattr(runner, "execute_tool_call") and hasattr(runner, "register_tool")
+
+
+def is_vision_capable(runner: object) -> bool:
+    """Check whether a runner implements VisionCapable."""
+    return hasattr(runner, "process_image")
+
+
+def is_response_format_capable(runner: object) -> bool:
+    """Check whether a runner implements ResponseFormatCapable."""
+    return hasattr(runner, "set_response_format")
+
+
 class AgentRunner(ABC):
     """Base class for all agent runners."""
 
@@ -121,9 +143,17 @@ class AgentRunner(ABC):
     @property
     @abstractmethod
     def capabilities(self) -> RunnerCapabilities:
-        """Declare what this runner can do."""
+        """Declare what this runner can do.
+
+        Implementations may use functools.cached_property; call
+        invalidate_capabilities() when state they depend on changes.
+        """
         pass
 
+    def invalidate_capabilities(self) -> None:
+        """Drop a cached capabilities value so it is recomputed on next access."""
+        self.__dict__.pop("capabilities", None)
+
     @abstractmethod
     async def execute_streaming(
         self,
@@ -11,6 +11,18 @@ from app.runners.models import (
     StreamChunk,
 )
 
+_CAPABILITIES = RunnerCapabilities(
+    supports_streaming=True,
+    supports_tool_use=True,
+    supports_vision=True,
+    supports_system_prompt_override=True,
+    context_window=200_000,
+    max_output_tokens=8_192,
+    supports_conversation_history=True,
+    supports_async_execution=True,
+    supports_prompt_caching=True,
+)
+
 
 class ClaudeAgentSDKRunner(AgentRunner):
     """Agent runner for Claude Agent SDK (placeholder for future implementation)."""
@@ -23,16 +35,7 @@ class ClaudeAgentSDKRunner(AgentRunner):
 
     @property
     def capabilities(self) -> RunnerCapabilities:
-        return RunnerCapabilities(
-            supports_streaming=True,
-            supports_tool_use=True,
-            supports_vision=True,
-            supports_system_prompt_override=True,
-            context_window=200_000,
-            max_output_tokens=8_192,
-            supports_conversation_history=True,
-            supports_async_execution=True,
-        )
+        return _CAPABILITIES
 
     async def execute_streaming(
         self,
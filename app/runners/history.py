@@ -0,0 +1,157 @@
+"""History processors for the Pydantic AI runner."""
+
+import logging
+from collections import OrderedDict
+from functools import cached_property
+from hashlib import blake2b
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate; close enough to decide when history needs folding
+_CHARS_PER_TOKEN = 4
+
+_SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below for an assistant that will continue it. "
+    "Keep facts, decisions, user preferences and open questions; drop small talk. "
+    "Write plain prose, no more than a few paragraphs."
+)
+
+
+def estimate_tokens(messages: list[ModelMessage]) -> int:
+    """Estimate the token count of a message history from its text length.
+
+    Args:
+        messages: Pydantic AI message history
+
+    Returns:
+        Approximate number of tokens
+    """
+    chars = 0
+    for message in messages:
+        for part in message.parts:
+            content = getattr(part, "content", None)
+            if isinstance(content, str):
+                chars += len(content)
+    return chars // _CHARS_PER_TOKEN
+
+
+def _is_user_turn(message: ModelMessage) -> bool:
+    """Check whether a message starts a user turn (not a tool return)."""
+    return isinstance(message, ModelRequest) and any(
+        isinstance(part, UserPromptPart) for part in message.parts
+    )
+
+
+def _transcript(messages: list[ModelMessage]) -> str:
+    """Render the text parts of a history as a plain transcript."""
+    lines = []
+    for message in messages:
+        for part in message.parts:
+            if isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                lines.append(f"User: {part.content}")
+            elif isinstance(part, SystemPromptPart):
+                lines.append(f"System: {part.content}")
+            elif isinstance(part, TextPart):
+                lines.append(f"Assistant: {part.content}")
+    return "\n\n".join(lines)
+
+
+class HistorySummarizer:
+    """Pydantic AI history processor that folds older messages into a summary.
+
+    Once a history is estimated to exceed max_tokens, everything before the
+    most recent messages is replaced by a single summary message. The split
+    point snaps to multiples of keep_messages (then forward to the next user
+    turn, so tool calls and their returns stay together), which keeps the
+    summarized part identical for several turns; summaries are cached by its
+    text (not the serialized messages, whose timestamps change every time the
+    runner rebuilds them), so those turns reuse one summary instead of calling
+    the model.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_tokens: int = 8000,
+        keep_messages: int = 10,
+        cache_size: int = 256,
+    ):
+        """Initialize the summarizer.
+
+        Args:
+            model: Model used to write summaries, ideally a cheap one
+            max_tokens: Estimated history size above which it is summarized
+            keep_messages: Minimum number of recent messages kept verbatim
+            cache_size: Number of summaries kept in memory
+        """
+        self.model = model
+        self.max_tokens = max_tokens
+        self.keep_messages = keep_messages
+        self.cache_size = cache_size
+        self._summaries: OrderedDict[bytes, str] = OrderedDict()
+
+    @cached_property
+    def _agent(self) -> Agent:
+        # Built on first use so a missing API key only matters once
+        # summarization is actually needed
+        return Agent(self.model, instructions=_SUMMARY_INSTRUCTIONS)
+
+    async def __call__(self, messages: list[ModelMessage]) -> list[ModelMessage]:
+        """Summarize older history if it is over the token budget.
+
+        Args:
+            messages: Message history, ending with the current request
+
+        Returns:
+            The history, with older messages replaced by a summary if needed
+        """
+        keep = self.keep_messages
+        if len(messages) <= 2 * keep or estimate_tokens(messages) <= self.max_tokens:
+            return messages
+
+        split = (len(messages) - keep) // keep * keep
+        while split < len(messages) - 1 and not _is_user_turn(messages[split]):
+            split += 1
+        if split >= len(messages) - 1:
+            return messages
+
+        older = messages[:split]
+        try:
+            summary = await self._summary(older)
+        except Exception as e:
+            logger.warning(f"History summarization failed, sending full history: {e}")
+            return messages
+
+        return [
+            ModelRequest(
+                parts=[SystemPromptPart(content=f"Summary of the earlier conversation:\n{summary}")]
+            ),
+            *messages[split:],
+        ]
+
+    async def _summary(self, messages: list[ModelMessage]) -> str:
+        """Get the summary of a history prefix, from the cache if possible."""
+        transcript = _transcript(messages)
+        key = blake2b(transcript.encode(), digest_size=16).digest()
+        summaries = self._summaries
+        summary = summaries.get(key)
+        if summary is not None:
+            summaries.move_to_end(key)
+            return summary
+
+        result = await self._agent.run(transcript)
+        summary = result.output
+
+        summaries[key] = summary
+        if len(summaries) > self.cache_size:
+            summaries.popitem(last=False)
+        return summary
@@ -1,11 +1,28 @@
 """Mock runner for testing."""
 
 from collections.abc import AsyncIterator
+from dataclasses import replace
+from functools import cached_property
 from typing import Any
 
 from app.runners.base import AgentRunner, RunnerCapabilities
 from app.runners.models import AgentMessage, ExecutionContext, ExecutionResult, StreamChunk
 
+# Characters per simulated stream chunk
+_CHUNK_SIZE = 64
+
+# Shared capabilities keyed by (should_stream, has_tools)
+_CAPABILITIES = {
+    (streaming, has_tools): RunnerCapabilities(
+        supports_streaming=streaming,
+        supports_tool_use=has_tools,
+        supports_vision=False,
+        supports_conversation_history=True,
+    )
+    for streaming in (False, True)
+    for has_tools in (False, True)
+}
+
 
 class MockRunner(AgentRunner):
     """Mock runner for testing."""
@@ -18,19 +35,25 @@ class MockRunner(AgentRunner):
     ):
         super().__init__(tools)
         self.mock_response = mock_response
-        self.should_stream = should_stream
+        self._should_stream = should_stream
         self.call_count = 0
         self.last_prompt = None
         self.last_history = None
+        self._chunks: tuple[str, list[str]] = ("", [])
+        self._result: ExecutionResult | None = None
 
     @property
+    def should_stream(self) -> bool:
+        return self._should_stream
+
+    @should_stream.setter
+    def should_stream(self, value: bool) -> None:
+        self._should_stream = value
+        self.invalidate_capabilities()
+
+    @cached_property
     def capabilities(self) -> RunnerCapabilities:
-        return RunnerCapabilities(
-            supports_streaming=self.should_stream,
-            supports_tool_use=bool(self.tools),
-            supports_vision=False,
-            supports_conversation_history=True,
-        )
+        return _CAPABILITIES[self.should_stream, bool(self.tools)]
 
     async def execute_streaming(
         self,
@@ -45,9 +68,22 @@ class MockRunner(AgentRunner):
         self.last_prompt = prompt
         self.last_history = message_history
 
-        # Simulate streaming by chunking response
-        for char in self.mock_response:
-            yield StreamChunk(content=char)
+        for content in self._stream_chunks():
+            yield StreamChunk(content=content)
+
+    def _stream_chunks(self) -> list[str]:
+        """Get the mock response split into fixed-size stream chunks.
+
+        The split is done once per distinct mock_response and replayed on later
+        calls; each call still yields its own StreamChunk objects.
+        """
+        response = self.mock_response
+        if self._chunks[0] != response:
+            self._chunks = (
+                response,
+                [response[i : i + _CHUNK_SIZE] for i in range(0, len(response), _CHUNK_SIZE)],
+            )
+        return self._chunks[1]
 
     async def execute_non_streaming(
         self,
@@ -62,10 +98,16 @@ class MockRunner(AgentRunner):
         self.last_prompt = prompt
         self.last_history = message_history
 
-        return ExecutionResult(
-            content=self.mock_response,
-            finish_reason="complete",
-        )
+        # Like the stream chunks, the result is built once per mock_response;
+        # each caller gets a copy with its own metadata, so annotating one
+        # result can't leak into later ones
+        result = self._result
+        if result is None or result.content != self.mock_response:
+            result = self._result = ExecutionResult(
+                content=self.mock_response,
+                finish_reason="complete",
+            )
+        return replace(result, metadata=dict(result.metadata))
 
     async def cleanup(self) -> None:
         """Clean up resources (no-op for mock runner)."""
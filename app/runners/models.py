@@ -1,11 +1,16 @@
-"""Domain models for agent runners."""
+"""Domain models for agent runners.
 
+These are slotted dataclasses rather than Pydantic models: runners build one
+StreamChunk per streamed token and the executor converts whole histories per
+turn, all from already-typed values that never cross an API boundary, so
+validation would only add overhead.
+"""
+
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field
-
 
 class MessageRole(str, Enum):
     """Standard message roles across all frameworks."""
@@ -16,20 +21,19 @@ class MessageRole(str, Enum):
     TOOL = "tool"
 
 
-class AgentMessage(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class AgentMessage:
     """Standardized message format for all runners."""
 
     role: MessageRole
     content: str
     tool_call_id: str | None = None
     tool_calls: list[dict[str, Any]] | None = None
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
-    class Config:
-        use_enum_values = True
 
-
-class ToolCall(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ToolCall:
     """Tool call information."""
 
     id: str
@@ -37,30 +41,58 @@ class ToolCall(BaseModel):
     arguments: dict[str, Any]
 
 
-class StreamChunk(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class StreamChunk:
     """Chunk of streaming response."""
 
     content: str = ""
     tool_calls: list[ToolCall] | None = None
     finish_reason: str | None = None
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
 
-class ExecutionResult(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ExecutionResult:
     """Complete execution result for non-streaming."""
 
     content: str
     tool_calls: list[ToolCall] | None = None
+    # Results of the tool calls made during the run
+    # ({"tool_call_id", "name", "content"} each)
+    tool_results: list[dict[str, Any]] | None = None
     finish_reason: str
     token_usage: dict[str, int] | None = None
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
+
 
+@dataclass(slots=True, kw_only=True)
+class ExecutionContext:
+    """Context for agent execution.
 
-class ExecutionContext(BaseModel):
-    """Context for agent execution."""
+    system_prompt is either plain text or a list of Anthropic-style text
+    blocks ({"type": "text", "text": ...}), which may carry cache_control
+    markers for runners that support prompt caching.
+    """
 
     conversation_id: UUID | None = None
-    system_prompt: str | None = None
+    system_prompt: str | list[dict[str, Any]] | None = None
+    # Stable id for a system prompt shared across conversations; runners can
+    # pass it to providers that route requests by prompt prefix for caching
+    system_prompt_id: str | None = None
     temperature: float | None = None
     max_tokens: int | None = None
-    additional_params: dict[str, Any] = Field(default_factory=dict)
+    additional_params: dict[str, Any] = field(default_factory=dict)
+
+
+def system_prompt_text(system_prompt: str | list[dict[str, Any]] | None) -> str | None:
+    """Flatten a system prompt given as text blocks into plain text.
+
+    Args:
+        system_prompt: System prompt string, list of text blocks, or None
+
+    Returns:
+        Plain text system prompt, or None if there is none
+    """
+    if system_prompt is None or isinstance(system_prompt, str):
+        return system_prompt
+    return "\n\n".join(block["text"] for block in system_prompt)
@@ -1,15 +1,22 @@
 """Agent runner for Pydantic AI framework."""
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable
+from functools import cached_property
 from typing import Any
 
 from pydantic_ai import Agent
 from pydantic_ai.messages import (
+    ModelMessage,
     ModelRequest,
     ModelResponse,
+    ModelResponsePart,
     TextPart,
+    ToolCallPart,
+    ToolReturnPart,
     UserPromptPart,
 )
+from pydantic_ai.models import Model
+from pydantic_ai.settings import ModelSettings
 
 from app.runners.base import AgentRunner, RunnerCapabilities
 from app.runners.models import (
@@ -18,40 +25,167 @@ from app.runners.models import (
     ExecutionResult,
     MessageRole,
     StreamChunk,
+    ToolCall,
+    system_prompt_text,
 )
 
 
+def _user_message(msg: AgentMessage) -> ModelRequest:
+    return ModelRequest(parts=[UserPromptPart(content=msg.content)])
+
+
+def _assistant_message(msg: AgentMessage) -> ModelResponse:
+    parts: list[ModelResponsePart] = []
+    if msg.content:
+        parts.append(TextPart(content=msg.content))
+    for call in msg.tool_calls or ():
+        parts.append(
+            ToolCallPart(tool_name=call["name"], args=call["arguments"], tool_call_id=call["id"])
+        )
+    return ModelResponse(parts=parts)
+
+
+def _tool_message(msg: AgentMessage) -> ModelRequest:
+    return ModelRequest(
+        parts=[
+            ToolReturnPart(
+                tool_name=msg.metadata.get("tool_name", ""),
+                content=msg.content,
+                tool_call_id=msg.tool_call_id or "",
+            )
+        ]
+    )
+
+
+# Builders for roles that map onto Pydantic AI history messages. System messages
+# come from the execution context instead. MessageRole is a str enum, so
+# lookups work with the member or its raw string value.
+_ROLE_BUILDERS: dict[str, Callable[[AgentMessage], ModelRequest | ModelResponse]] = {
+    MessageRole.USER: _user_message,
+    MessageRole.ASSISTANT: _assistant_message,
+    MessageRole.TOOL: _tool_message,
+}
+
+
+def _tool_activity(
+    messages: list[ModelMessage],
+) -> tuple[list[ToolCall] | None, list[dict[str, Any]] | None]:
+    """Collect the tool calls and tool results from a run's new messages."""
+    tool_calls: list[ToolCall] = []
+    tool_results: list[dict[str, Any]] = []
+    for message in messages:
+        for part in message.parts:
+            if isinstance(part, ToolCallPart):
+                tool_calls.append(
+                    ToolCall(
+                        id=part.tool_call_id,
+                        name=part.tool_name,
+                        arguments=part.args_as_dict(),
+                    )
+                )
+            elif isinstance(part, ToolReturnPart):
+                tool_results.append(
+                    {
+                        "tool_call_id": part.tool_call_id,
+                        "name": part.tool_name,
+                        "content": part.model_response_str(),
+                    }
+                )
+    return tool_calls or None, tool_results or None
+
+
+# Capabilities only vary with whether the agent has tools registered
+_CAPABILITIES = {
+    has_tools: RunnerCapabilities(
+        supports_streaming=True,
+        supports_tool_use=has_tools,
+        supports_vision=False,  # Depends on model
+        supports_system_prompt_override=True,
+        context_window=None,  # Model-dependent
+        max_output_tokens=None,  # Model-dependent
+        supports_conversation_history=True,
+        supports_async_execution=True,
+    )
+    for has_tools in (False, True)
+}
+
+# Shared kwargs for runs without an execution context; never mutated
+_NO_RUN_KWARGS: dict[str, Any] = {}
+
+
+def _run_kwargs(
+    context: ExecutionContext | None, send_prompt_cache_key: bool = False
+) -> dict[str, Any]:
+    """Build the Agent.run / run_stream keyword arguments for a context.
+
+    Pydantic AI takes the system prompt as ``instructions`` and output limits
+    through ``model_settings``; it has no ``system_prompt`` or ``max_tokens``
+    run arguments. Instructions are plain text, so system prompt blocks are
+    flattened and any cache_control markers dropped.
+
+    With send_prompt_cache_key, the context's system_prompt_id is sent as
+    OpenAI's ``prompt_cache_key``, so requests sharing a system prompt are
+    routed to the same prompt cache across conversations.
+    """
+    if context is None:
+        return _NO_RUN_KWARGS
+
+    kwargs: dict[str, Any] = {}
+    system_prompt = system_prompt_text(context.system_prompt)
+    if system_prompt:
+        kwargs["instructions"] = system_prompt
+
+    model_settings = ModelSettings()
+    max_tokens = context.max_tokens
+    if max_tokens:
+        model_settings["max_tokens"] = max_tokens
+    system_prompt_id = context.system_prompt_id
+    if send_prompt_cache_key and system_prompt_id:
+        model_settings["extra_body"] = {"prompt_cache_key": system_prompt_id}
+    if model_settings:
+        kwargs["model_settings"] = model_settings
+    return kwargs
+
+
+def _model_system(agent: Agent) -> str | None:
+    """Get the provider system ("openai", "anthropic", ...) of an agent's model."""
+    model = agent.model
+    if isinstance(model, Model):
+        return model.system
+    if isinstance(model, str):
+        return model.partition(":")[0]
+    return None
+
+
 class PydanticAIRunner(AgentRunner):
     """Agent runner for Pydantic AI framework."""
 
     def __init__(self, agent: Agent, tools: list[Any] | None = None):
         super().__init__(tools)
         self.agent = agent
+        # Only OpenAI (and OpenAI-compatible servers) accept prompt_cache_key;
+        # other providers reject unknown request fields
+        self._send_prompt_cache_key = _model_system(agent) == "openai"
 
         # Register tools with Pydantic AI agent
         if self.tools:
             for tool in self.tools:
                 self.agent.tool(tool)
 
-    @property
+    @cached_property
     def capabilities(self) -> RunnerCapabilities:
         # Check for tools - try both old and new attribute names
         has_tools = False
         if hasattr(self.agent, "_function_toolset"):
-            has_tools = bool(self.agent._function_toolset)
+            # The function toolset exists (and is truthy) even with no tools
+            # registered, so check its tools and any extra toolsets instead
+            has_tools = bool(self.agent._function_toolset.tools) or bool(
+                getattr(self.agent, "_user_toolsets", None)
+            )
         elif hasattr(self.agent, "_function_tools"):
             has_tools = bool(self.agent._function_tools)
 
-        return RunnerCapabilities(
-            supports_streaming=True,
-            supports_tool_use=has_tools,
-            supports_vision=False,  # Depends on model
-            supports_system_prompt_override=True,
-            context_window=None,  # Model-dependent
-            max_output_tokens=None,  # Model-dependent
-            supports_conversation_history=True,
-            supports_async_execution=True,
-        )
+        return _CAPABILITIES[has_tools]
 
     async def execute_streaming(
         self,
@@ -65,18 +199,11 @@ class PydanticAIRunner(AgentRunner):
         # Convert message history to Pydantic AI format
         messages = self._convert_messages(message_history or [])
 
-        # Build run parameters
-        run_params = {}
-        if context and context.system_prompt:
-            run_params["system_prompt"] = context.system_prompt
-        if context and context.max_tokens:
-            run_params["max_tokens"] = context.max_tokens
-
         # Stream execution
         async with self.agent.run_stream(
             prompt,
             message_history=messages,
-            **run_params,
+            **_run_kwargs(context, self._send_prompt_cache_key),
         ) as response:
             async for chunk in response.stream_text():
                 yield StreamChunk(content=chunk, metadata={"raw_chunk": chunk})
@@ -93,18 +220,11 @@ class PydanticAIRunner(AgentRunner):
         # Convert message history
         messages = self._convert_messages(message_history or [])
 
-        # Build run parameters
-        run_params = {}
-        if context and context.system_prompt:
-            run_params["system_prompt"] = context.system_prompt
-        if context and context.max_tokens:
-            run_params["max_tokens"] = context.max_tokens
-
         # Execute
         result = await self.agent.run(
             prompt,
             message_history=messages,
-            **run_params,
+            **_run_kwargs(context, self._send_prompt_cache_key),
         )
 
         # Convert token usage to dict if available
@@ -117,8 +237,12 @@ class PydanticAIRunner(AgentRunner):
                     "output_tokens": usage.output_tokens,
                 }
 
+        tool_calls, tool_results = _tool_activity(result.new_messages())
+
         return ExecutionResult(
             content=str(result.output),
+            tool_calls=tool_calls,
+            tool_results=tool_results,
             finish_reason="complete",
             token_usage=token_usage,
             metadata={"raw_result": result},
@@ -130,21 +254,19 @@ class PydanticAIRunner(AgentRunner):
         Converts AgentMessage objects to Pydantic AI's ModelRequest/ModelResponse format.
         ModelRequest represents user/system messages, ModelResponse represents assistant messages.
         """
+        builders = _ROLE_BUILDERS
         converted = []
         for msg in messages:
-            if msg.role == MessageRole.USER:
-                # Create a ModelRequest with UserPromptPart for user messages
-                converted.append(ModelRequest(parts=[UserPromptPart(content=msg.content)]))
-            elif msg.role == MessageRole.ASSISTANT:
-                # Create a ModelResponse with TextPart for assistant messages
-                converted.append(ModelResponse(parts=[TextPart(content=msg.content)]))
-            # System messages are handled via system_prompt parameter in run()
+            builder = builders.get(msg.role)
+            if builder is not None:
+                converted.append(builder(msg))
         return converted
 
     async def register_tool(self, tool: Any) -> None:
         """Register a tool with the Pydantic AI agent."""
         self.agent.tool(tool)
         self.tools.append(tool)
+        self.invalidate_capabilities()
 
     async def cleanup(self) -> None:
         """Clean up resources (no-op for Pydantic AI runner)."""
@@ -1,6 +1,13 @@
 """Service for executing agents with conversation context."""
 
+import asyncio
+import io
+import itertools
+import logging
+import re
 from collections.abc import AsyncIterator
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Any, cast
 from uuid import UUID
 
@@ -10,12 +17,139 @@ from app.adapters.base import (
     MessageStyle,
     ReactionCapable,
     StreamingCapable,
+    is_reaction_capable,
+    is_streaming_capable,
 )
-from app.models.domain import MessageRole
+from app.config import get_settings
+from app.models.domain import Message, MessageRole
 from app.runners.base import AgentRunner
-from app.runners.models import ExecutionContext, StreamChunk
+from app.runners.models import AgentMessage, ExecutionContext, ExecutionResult, StreamChunk
 from app.runners.models import MessageRole as RunnerMessageRole
 from app.services.conversation_manager import ConversationManager
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_BASE_PROMPT = "You are a helpful AI assistant."
+
+_STYLE_GUIDELINES = {
+    MessageStyle.CONVERSATIONAL: (
+        "\n\nChannel Context: You are communicating via a real-time "
+        "messaging platform (like Slack).\n\n"
+        "Guidelines:\n"
+        "- Keep responses concise and conversational\n"
+        "- Ask clarifying questions ONE at a time (user can respond quickly)\n"
+        "- Use short paragraphs and bullet points\n"
+        "- Expect quick back-and-forth dialogue\n"
+        "- Don't overwhelm with too much information at once"
+    ),
+    MessageStyle.COMPREHENSIVE: (
+        "\n\nChannel Context: You are communicating via email or another "
+        "asynchronous channel.\n\n"
+        "Guidelines:\n"
+        "- Write comprehensive, detailed responses\n"
+        "- Anticipate follow-up questions and address them proactively\n"
+        "- If you need information, ask ALL clarifying questions in one message\n"
+        "- Structure responses with clear sections and headings\n"
+        "- Include context and explanations - user may not reply immediately\n"
+        "- Be thorough rather than brief"
+    ),
+}
+
+
+def _build_channel_prompt(
+    style: MessageStyle, rich_formatting: bool, interactive_elements: bool
+) -> str:
+    """Build the system prompt for one combination of channel capabilities."""
+    prompt = _BASE_PROMPT + _STYLE_GUIDELINES.get(style, "")
+
+    # Note formatting capabilities
+    if rich_formatting:
+        prompt += "\n- You can use rich formatting (markdown, HTML, etc.)"
+
+    if interactive_elements:
+        prompt += "\n- You can suggest interactive elements (buttons, forms)"
+
+    return prompt
+
+
+# Every combination of channel capabilities, built once at import
+_CHANNEL_PROMPTS = {
+    key: _build_channel_prompt(*key)
+    for key in itertools.product(MessageStyle, (False, True), (False, True))
+}
+
+
+# Domain roles to runner roles; a lookup instead of constructing the enum
+# for every message in the history
+_RUNNER_ROLES = {role.value: role for role in RunnerMessageRole}
+
+
+# Credentials tools sometimes echo back: OpenAI-style API keys, Slack tokens
+# and bearer tokens. Redacted before tool results are stored.
+_SECRET_RE = re.compile(
+    r"sk-[A-Za-z0-9_-]{16,}|xox[abposr]-[A-Za-z0-9-]{10,}|Bearer\s+[A-Za-z0-9._~+/=-]{16,}"
+)
+
+
+def _tool_results_for_storage(
+    tool_results: list[dict[str, Any]], max_chars: int
+) -> list[dict[str, Any]]:
+    """Redact secrets from tool results and cap each one's size."""
+    stored = []
+    for tool_result in tool_results:
+        content = _SECRET_RE.sub("[redacted]", tool_result["content"])
+        if len(content) > max_chars:
+            content = content[:max_chars] + " [truncated]"
+        stored.append({**tool_result, "content": content})
+    return stored
+
+
+@lru_cache(maxsize=16)
+def _prompt_id(prompt: str) -> str:
+    """Get a short stable id for a system prompt."""
+    return blake2b(prompt.encode(), digest_size=8).hexdigest()
+
+
+async def _send_chunks(
+    chunks: asyncio.Queue[str | None],
+    adapter: ChannelAdapter,
+    conversation_id: UUID,
+    thread_id: str | None,
+    metadata: dict | None,
+) -> str | None:
+    """Send streamed chunks to a channel until the None sentinel arrives.
+
+    The first chunk creates the channel message and later ones are appended
+    to it. Chunks that queue up while an adapter call is in flight are joined
+    and sent as one update.
+
+    Returns:
+        ID of the channel message, or None if no chunks were sent
+    """
+    message_id = None
+    done = False
+    while not done:
+        parts = [await chunks.get()]
+        while not chunks.empty():
+            parts.append(chunks.get_nowait())
+        if parts[-1] is None:
+            parts.pop()
+            done = True
+        if not parts:
+            continue
+        text = "".join(cast(list[str], parts))
+
+        if message_id is None:
+            message_id = await adapter.send_message(
+                text, conversation_id, thread_id=thread_id, metadata=metadata
+            )
+        else:
+            await cast(StreamingCapable, adapter).stream_message_chunk(
+                text, conversation_id, message_id
+            )
+    return message_id
 
 
 class AgentExecutor:
@@ -28,15 +162,39 @@ class AgentExecutor:
     - Handle errors and retries
     """
 
-    def __init__(self, runner: AgentRunner, conversation_manager: ConversationManager):
+    def __init__(
+        self,
+        runner: AgentRunner,
+        conversation_manager: ConversationManager,
+        response_cache: ResponseCache | None = None,
+        history_window: int | None = None,
+        history_token_budget: int | None = None,
+    ):
         """Initialize with runner and conversation manager.
 
         Args:
             runner: AgentRunner instance for agent execution
             conversation_manager: ConversationManager for persistence
+            response_cache: Optional cache for responses to identical inputs
+            history_window: Messages of history to send to the agent (0 for
+                all); defaults to the agent_history_window setting
+            history_token_budget: Token budget for history (0 for none);
+                defaults to the agent_history_token_budget setting
         """
         self.runner = runner
         self.conversation_manager = conversation_manager
+        self.response_cache = response_cache
+        self.history_window = (
+            settings.agent_history_window if history_window is None else history_window
+        )
+        self.history_token_budget = (
+            settings.agent_history_token_budget
+            if history_token_budget is None
+            else history_token_budget
+        )
+        self.tool_carryover_turns = settings.tool_carryover_max_turns
+        self.tool_result_max_chars = settings.tool_carryover_per_entry_chars
+        self._pending_writes: set[asyncio.Task[None]] = set()
 
     async def execute_sync(
         self,
@@ -48,6 +206,10 @@ class AgentExecutor:
         This method is used for chatbot and sidekick patterns where
         the user expects an immediate streaming response.
 
+        The assistant response is saved in the background once the stream
+        ends, so the end of the response isn't held up by the write; callers
+        must await aclose() before the conversation manager's session closes.
+
         Args:
             conversation_id: Conversation identifier
             user_message: User's input message
@@ -55,17 +217,33 @@ class AgentExecutor:
         Yields:
             String chunks of the response
         """
-        # Add user message to conversation
-        await self.conversation_manager.add_message(conversation_id, MessageRole.USER, user_message)
-
-        # Load message history for context
-        messages = await self.conversation_manager.get_messages(conversation_id)
+        # Add user message and load the history before it; the message itself
+        # reaches the runner as the prompt
+        _, messages = await self.conversation_manager.add_and_fetch(
+            conversation_id,
+            MessageRole.USER,
+            user_message,
+            window=self.history_window,
+            max_tokens=self.history_token_budget,
+        )
 
         # Convert to agent runner format
-        history = [self._to_agent_message(msg) for msg in messages]
-
-        # Execute with runner
-        response_content = []
+        history = self._to_agent_history(messages)
+
+        # Tool calls can have side effects and depend on external state, so
+        # only tool-free runs are served from or written to the cache
+        cache = self.response_cache
+        cache_key = None
+        if cache is not None and not self.runner.capabilities.supports_tool_use:
+            cache_key = cache.make_key(history, user_message)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                self._save_response_in_background(conversation_id, cached)
+                return
+
+        # Execute with runner, accumulating the response as it streams
+        response_buffer = io.StringIO()
         async with self.runner.session():
             context = ExecutionContext(conversation_id=conversation_id)
 
@@ -78,16 +256,48 @@ class AgentExecutor:
                 ),
             )
             async for chunk in stream:
-                response_content.append(chunk.content)
+                response_buffer.write(chunk.content)
                 yield chunk.content
 
         # Save assistant response
-        await self.conversation_manager.add_message(
-            conversation_id,
-            MessageRole.ASSISTANT,
-            "".join(response_content),
+        self._save_response_in_background(
+            conversation_id, response_buffer.getvalue(), cache_key=cache_key
         )
 
+    async def aclose(self) -> None:
+        """Wait for background response writes started by execute_sync()."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    def _save_response_in_background(
+        self, conversation_id: UUID, content: str, cache_key: str | None = None
+    ) -> None:
+        """Save an assistant response (and cache it) without blocking the caller.
+
+        Args:
+            conversation_id: Conversation identifier
+            content: Complete response text
+            cache_key: Response cache key, if the response should be cached
+        """
+        task = asyncio.create_task(self._save_response(conversation_id, content, cache_key))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def _save_response(
+        self, conversation_id: UUID, content: str, cache_key: str | None
+    ) -> None:
+        """Save an assistant response, logging instead of raising on failure."""
+        try:
+            await self.conversation_manager.add_message(
+                conversation_id, MessageRole.ASSISTANT, content
+            )
+        except Exception as e:
+            logger.error(f"Failed to save response for conversation {conversation_id}: {e}")
+            return
+
+        if cache_key is not None and self.response_cache is not None:
+            await self.response_cache.set(cache_key, content)
+
     async def execute_async(
         self,
         conversation_id: UUID,
@@ -106,14 +316,17 @@ class AgentExecutor:
         Returns:
             Final agent response
         """
-        # Add user message
-        await self.conversation_manager.add_message(conversation_id, MessageRole.USER, prompt)
-
-        # Load message history for context
-        messages = await self.conversation_manager.get_messages(conversation_id)
+        # Add user message and load the history before it
+        _, messages = await self.conversation_manager.add_and_fetch(
+            conversation_id,
+            MessageRole.USER,
+            prompt,
+            window=self.history_window,
+            max_tokens=self.history_token_budget,
+        )
 
         # Convert to agent runner format
-        history = [self._to_agent_message(msg) for msg in messages]
+        history = self._to_agent_history(messages)
 
         # Execute with runner
         async with self.runner.session():
@@ -126,9 +339,7 @@ class AgentExecutor:
             )
 
         # Save assistant response
-        await self.conversation_manager.add_message(
-            conversation_id, MessageRole.ASSISTANT, result.content
-        )
+        await self._save_result(conversation_id, result)
 
         return result.content
 
@@ -148,24 +359,18 @@ class AgentExecutor:
         Returns:
             Final agent response
         """
-        # Load existing message history
-        messages = await self.conversation_manager.get_messages(conversation_id)
-
-        if not messages:
-            raise ValueError(f"No messages found in conversation {conversation_id}")
-
-        # Get the last user message as the prompt
-        user_message = None
-        for msg in reversed(messages):
-            if msg.role == MessageRole.USER:
-                user_message = msg.content
-                break
-
-        if not user_message:
+        # The prompt is the latest user message
+        prompt_message = await self.conversation_manager.get_last_user_message(conversation_id)
+        if prompt_message is None or not prompt_message.content:
             raise ValueError(f"No user message found in conversation {conversation_id}")
+        user_message = prompt_message.content
 
-        # Convert to agent runner format
-        history = [self._to_agent_message(msg) for msg in messages]
+        # Load existing message history; the prompt message is passed as the
+        # prompt, so it's left out of the history
+        messages = await self.conversation_manager.get_history(
+            conversation_id, window=self.history_window, max_tokens=self.history_token_budget
+        )
+        history = self._to_agent_history([msg for msg in messages if msg.id != prompt_message.id])
 
         # Execute with runner
         async with self.runner.session():
@@ -178,16 +383,14 @@ class AgentExecutor:
             )
 
         # Save assistant response
-        await self.conversation_manager.add_message(
-            conversation_id, MessageRole.ASSISTANT, result.content
-        )
+        await self._save_result(conversation_id, result)
 
         return result.content
 
     async def execute_with_channel_context(
         self,
         conversation_id: UUID,
-        user_message: str,
+        user_message: str | AsyncIterator[str],
         adapter: ChannelAdapter,
         thread_id: str | None = None,
         adapter_metadata: dict | None = None,
@@ -197,9 +400,13 @@ class AgentExecutor:
         This method adapts agent behavior based on the channel adapter's capabilities
         (streaming, rich formatting, interaction style, etc.).
 
+        The user message may also be given as an async iterator of text parts,
+        for channels that deliver it incrementally; the history is then loaded
+        while the rest of the message is still arriving.
+
         Args:
             conversation_id: Conversation identifier
-            user_message: User's message
+            user_message: User's message, or an async iterator of its parts
             adapter: ChannelAdapter instance for sending responses
             thread_id: Optional channel-specific thread ID
             adapter_metadata: Optional channel-specific metadata
@@ -212,30 +419,65 @@ class AgentExecutor:
         # Note: Channel-aware system prompt can be built here using
         # _build_system_prompt_for_channel and passed via ExecutionContext
 
-        # Add user message to conversation
-        await self.conversation_manager.add_message(conversation_id, MessageRole.USER, user_message)
-
-        # Get conversation history
-        messages = await self.conversation_manager.get_messages(conversation_id)
+        if isinstance(user_message, str):
+            # Add user message and load the history before it
+            _, messages = await self.conversation_manager.add_and_fetch(
+                conversation_id,
+                MessageRole.USER,
+                user_message,
+                window=self.history_window,
+                max_tokens=self.history_token_budget,
+            )
+        else:
+            # Load the history while the message is still arriving, then add it
+            history_task = asyncio.create_task(
+                self.conversation_manager.get_history(
+                    conversation_id,
+                    window=self.history_window,
+                    max_tokens=self.history_token_budget,
+                )
+            )
+            try:
+                user_message = "".join([part async for part in user_message])
+                messages = await history_task
+            except BaseException:
+                history_task.cancel()
+                raise
+            await self.conversation_manager.add_message(
+                conversation_id, MessageRole.USER, user_message
+            )
 
         # Convert to agent runner format
-        history = [self._to_agent_message(msg) for msg in messages]
+        history = self._to_agent_history(messages)
 
         # Execute agent
-        full_response = ""
+        tool_calls = tool_results = None
         async with self.runner.session():
+            channel_prompt = self._build_system_prompt_for_channel(caps)
+            system_prompt: str | list[dict[str, Any]] = channel_prompt
+            if self.runner.capabilities.supports_prompt_caching:
+                # The channel prompt is identical on every turn; one cache
+                # breakpoint at its end lets the provider reuse it
+                system_prompt = [
+                    {
+                        "type": "text",
+                        "text": channel_prompt,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
             context = ExecutionContext(
                 conversation_id=conversation_id,
-                system_prompt=self._build_system_prompt_for_channel(caps),
+                system_prompt=system_prompt,
+                system_prompt_id=_prompt_id(channel_prompt),
             )
 
             if (
                 caps.supports_streaming
                 and self.runner.capabilities.supports_streaming
-                and isinstance(adapter, StreamingCapable)
+                and is_streaming_capable(adapter)
             ):
                 # Handle streaming response
-                message_id = None
+                response_buffer = io.StringIO()
 
                 stream = cast(
                     AsyncIterator[StreamChunk],
@@ -245,26 +487,32 @@ class AgentExecutor:
                         context=context,
                     ),
                 )
-                async for chunk in stream:
-                    full_response += chunk.content
-
-                    # Send first chunk to establish message
-                    if message_id is None:
-                        message_id = await adapter.send_message(
-                            chunk.content,
-                            conversation_id,
-                            thread_id=thread_id,
-                            metadata=adapter_metadata,
-                        )
-                    else:
-                        # Stream subsequent chunks
-                        await adapter.stream_message_chunk(
-                            chunk.content, conversation_id, message_id
-                        )
+
+                # Relay chunks to the channel from a separate task so a slow
+                # adapter call never holds up reading the model stream
+                chunks: asyncio.Queue[str | None] = asyncio.Queue()
+                sender = asyncio.create_task(
+                    _send_chunks(chunks, adapter, conversation_id, thread_id, adapter_metadata)
+                )
+                try:
+                    async for chunk in stream:
+                        response_buffer.write(chunk.content)
+                        chunks.put_nowait(chunk.content)
+                        if sender.done():
+                            break
+                    chunks.put_nowait(None)
+                    message_id = await sender
+                except BaseException:
+                    sender.cancel()
+                    raise
+
+                full_response = response_buffer.getvalue()
 
                 # Mark complete
-                if isinstance(adapter, ReactionCapable) and message_id:
-                    await adapter.add_reaction(message_id, "white_check_mark")
+                if is_reaction_capable(adapter) and message_id:
+                    await cast(ReactionCapable, adapter).add_reaction(
+                        message_id, "white_check_mark"
+                    )
             else:
                 # Handle complete message (no streaming)
                 result = await self.runner.execute_non_streaming(
@@ -273,6 +521,7 @@ class AgentExecutor:
                     context=context,
                 )
                 full_response = result.content
+                tool_calls, tool_results = self._tool_fields(result)
 
                 await adapter.send_message(
                     full_response,
@@ -283,7 +532,11 @@ class AgentExecutor:
 
         # Save assistant response to conversation
         await self.conversation_manager.add_message(
-            conversation_id, MessageRole.ASSISTANT, full_response
+            conversation_id,
+            MessageRole.ASSISTANT,
+            full_response,
+            tool_calls=tool_calls,
+            tool_results=tool_results,
         )
 
         return full_response
@@ -297,55 +550,109 @@ class AgentExecutor:
         Returns:
             System prompt string tailored to the channel
         """
-        base_prompt = "You are a helpful AI assistant."
-
-        # Adapt for interaction style
-        if capabilities.preferred_message_style == MessageStyle.CONVERSATIONAL:
-            base_prompt += (
-                "\n\nChannel Context: You are communicating via a real-time "
-                "messaging platform (like Slack).\n\n"
-                "Guidelines:\n"
-                "- Keep responses concise and conversational\n"
-                "- Ask clarifying questions ONE at a time (user can respond quickly)\n"
-                "- Use short paragraphs and bullet points\n"
-                "- Expect quick back-and-forth dialogue\n"
-                "- Don't overwhelm with too much information at once"
+        return _CHANNEL_PROMPTS[
+            (
+                capabilities.preferred_message_style,
+                bool(capabilities.supports_rich_formatting),
+                bool(capabilities.supports_interactive_elements),
             )
-        elif capabilities.preferred_message_style == MessageStyle.COMPREHENSIVE:
-            base_prompt += (
-                "\n\nChannel Context: You are communicating via email or another "
-                "asynchronous channel.\n\n"
-                "Guidelines:\n"
-                "- Write comprehensive, detailed responses\n"
-                "- Anticipate follow-up questions and address them proactively\n"
-                "- If you need information, ask ALL clarifying questions in one message\n"
-                "- Structure responses with clear sections and headings\n"
-                "- Include context and explanations - user may not reply immediately\n"
-                "- Be thorough rather than brief"
+        ]
+
+    async def _save_result(self, conversation_id: UUID, result: ExecutionResult) -> None:
+        """Save a non-streaming result as an assistant message, with its tool activity."""
+        tool_calls, tool_results = self._tool_fields(result)
+        await self.conversation_manager.add_message(
+            conversation_id,
+            MessageRole.ASSISTANT,
+            result.content,
+            tool_calls=tool_calls,
+            tool_results=tool_results,
+        )
+
+    def _tool_fields(
+        self, result: ExecutionResult
+    ) -> tuple[list[dict[str, Any]] | None, list[dict[str, Any]] | None]:
+        """Get a result's tool calls and tool results in their stored form."""
+        tool_calls = None
+        if result.tool_calls:
+            tool_calls = [
+                {"id": call.id, "name": call.name, "arguments": call.arguments}
+                for call in result.tool_calls
+            ]
+        tool_results = None
+        if result.tool_results:
+            tool_results = _tool_results_for_storage(
+                result.tool_results, self.tool_result_max_chars
             )
+        return tool_calls, tool_results
 
-        # Note formatting capabilities
-        if capabilities.supports_rich_formatting:
-            base_prompt += "\n- You can use rich formatting (markdown, HTML, etc.)"
+    def _to_agent_history(self, messages: list[Message]) -> list[AgentMessage]:
+        """Convert stored messages to the history passed to the runner.
 
-        if capabilities.supports_interactive_elements:
-            base_prompt += "\n- You can suggest interactive elements (buttons, forms)"
+        The most recent tool-using turns (up to tool_carryover_turns) are
+        replayed with their tool calls and results, so a follow-up question
+        can be answered from the earlier results instead of calling the same
+        tools again. Older turns keep only their final text.
 
-        return base_prompt
+        Args:
+            messages: Stored messages, oldest first
+
+        Returns:
+            AgentMessages for the runner
+        """
+        carried: set[int] = set()
+        if self.tool_carryover_turns > 0:
+            for i in range(len(messages) - 1, -1, -1):
+                if messages[i].tool_calls and messages[i].tool_results:
+                    carried.add(i)
+                    if len(carried) == self.tool_carryover_turns:
+                        break
+
+        history = []
+        for i, msg in enumerate(messages):
+            if i in carried:
+                history.extend(self._tool_turn_messages(msg))
+            else:
+                history.append(self._to_agent_message(msg))
+        return history
+
+    @staticmethod
+    def _tool_turn_messages(message: Message) -> list[AgentMessage]:
+        """Expand an assistant message that used tools into its tool exchange."""
+        tool_results = message.tool_results or []
+        answered = {tool_result["tool_call_id"] for tool_result in tool_results}
+        return [
+            AgentMessage(
+                role=RunnerMessageRole.ASSISTANT,
+                content="",
+                tool_calls=[call for call in message.tool_calls or [] if call["id"] in answered],
+            ),
+            *(
+                AgentMessage(
+                    role=RunnerMessageRole.TOOL,
+                    content=tool_result["content"],
+                    tool_call_id=tool_result["tool_call_id"],
+                    metadata={"tool_name": tool_result["name"]},
+                )
+                for tool_result in tool_results
+            ),
+            AgentMessage(role=RunnerMessageRole.ASSISTANT, content=message.content),
+        ]
 
-    def _to_agent_message(self, db_message: Any) -> Any:
+    def _to_agent_message(self, db_message: Message) -> AgentMessage:
         """Convert database message to AgentMessage.
 
+        Only role and content are carried over, never ids or timestamps, so a
+        conversation's history converts to the same prompt prefix on every
+        turn. Tool activity is replayed separately, by _to_agent_history.
+
         Args:
             db_message: Message from database
 
         Returns:
             AgentMessage for runner
         """
-        from app.runners.models import AgentMessage
-
         return AgentMessage(
-            role=RunnerMessageRole(db_message.role),
+            role=_RUNNER_ROLES[db_message.role],
             content=db_message.content,
-            tool_calls=getattr(db_message, "tool_calls", None),
         )
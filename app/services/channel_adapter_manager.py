@@ -16,6 +16,17 @@ logger = logging.getLogger(__name__)
 _global_adapters: dict[str, ChannelAdapter] = {}
 
 
+async def _close_adapter(name: str, adapter: ChannelAdapter) -> None:
+    """Release resources held by an adapter, if it has any to release."""
+    aclose = getattr(adapter, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception as e:
+        logger.warning(f"Error closing adapter {name}: {e}")
+
+
 class SecurityError(Exception):
     """Raised when request signature verification fails."""
 
@@ -33,11 +44,17 @@ class ChannelAdapterManager:
     async def register_adapter(self, name: str, adapter: ChannelAdapter) -> None:
         """Register a new channel adapter.
 
+        An adapter already registered under the same name is replaced and
+        closed, so only replace adapters outside of request and job handling.
+
         Args:
             name: Adapter name (e.g., "slack", "email", "github")
             adapter: ChannelAdapter instance
         """
+        previous = self._adapters.get(name)
         self._adapters[name] = adapter
+        if previous is not None and previous is not adapter:
+            await _close_adapter(name, previous)
 
     def get_adapter(self, name: str) -> ChannelAdapter:
         """Get a registered adapter by name.
@@ -258,8 +275,9 @@ async def initialize_adapters() -> None:
     """Initialize and register all configured channel adapters.
 
     This function instantiates adapters based on environment configuration
-    and registers them globally. It should be called during application startup
-    and can be called again in worker processes.
+    and registers them globally. It should be called once during application
+    or worker startup; adapters that are already registered are kept, so a
+    repeated call never replaces (and closes) an adapter that is in use.
     """
     from app.config import get_settings
 
@@ -267,7 +285,9 @@ async def initialize_adapters() -> None:
     manager = ChannelAdapterManager()
 
     # Initialize Slack adapter if configured
-    if settings.slack_bot_token and settings.slack_signing_secret:
+    if "slack" in _global_adapters:
+        logger.debug("Slack adapter already initialized")
+    elif settings.slack_bot_token and settings.slack_signing_secret:
         from app.adapters.slack import SlackChannelAdapter
 
         slack_adapter = SlackChannelAdapter(
@@ -280,14 +300,29 @@ async def initialize_adapters() -> None:
         logger.debug("Slack adapter not configured (missing credentials)")
 
     # Initialize Email adapter if configured
-    if settings.mailgun_api_key and settings.mailgun_domain:
+    if "email" in _global_adapters:
+        logger.debug("Email adapter already initialized")
+    elif settings.mailgun_api_key and settings.mailgun_domain:
         from app.adapters.email import EmailChannelAdapter
 
         email_adapter = EmailChannelAdapter(
             mailgun_api_key=settings.mailgun_api_key,
             mailgun_domain=settings.mailgun_domain,
+            from_email=settings.mailgun_from_email,
         )
         await manager.register_adapter("email", email_adapter)
         logger.info("Email adapter (Mailgun) initialized")
     else:
         logger.debug("Email adapter not configured (missing credentials)")
+
+
+async def close_adapters() -> None:
+    """Close all registered channel adapters.
+
+    Should be called during application shutdown so adapters can release
+    pooled HTTP connections.
+    """
+    adapters = list(_global_adapters.items())
+    _global_adapters.clear()
+    for name, adapter in adapters:
+        await _close_adapter(name, adapter)
@@ -3,16 +3,95 @@
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from pydantic_core import to_json
+from sqlalchemy import Row, bindparam, func, lambda_stmt, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database.models import ConversationDB, MessageDB
-from app.models.domain import ConversationThread, Message, MessageRole
+from app.models.domain import ConversationThread, Message, MessagePage, MessageRole
+
+# Statements are built once at import so every call hits SQLAlchemy's compiled
+# SQL cache without rebuilding the expression tree.
+# The plain lookup selects from the table so it returns a Core Row and skips
+# ORM identity-map and instance-state bookkeeping; loading messages needs the
+# ORM relationship.
+_GET_CONVERSATION_STMT = select(ConversationDB.__table__).where(
+    ConversationDB.id == bindparam("conversation_id")
+)
+_GET_CONVERSATION_WITH_MESSAGES_STMT = (
+    select(ConversationDB)
+    .where(ConversationDB.id == bindparam("conversation_id"))
+    .options(selectinload(ConversationDB.messages))
+)
+
+# Tokens are estimated from length rather than with a model tokenizer; close
+# enough for budgeting how much history to send
+_CHARS_PER_TOKEN = 4
+
+# The most recent messages that fit a token budget, selected in the database:
+# a running total of token counts, newest first, is compared with the budget,
+# and the newest message is always kept. Rows stored before token_count
+# existed fall back to the same length estimate used on insert.
+_NEWEST_FIRST = (MessageDB.created_at.desc(), MessageDB.id.desc())
+_RANKED_MESSAGES = (
+    select(
+        MessageDB.id,
+        func.row_number().over(order_by=_NEWEST_FIRST).label("position"),
+        func.sum(
+            func.coalesce(MessageDB.token_count, func.length(MessageDB.content) // _CHARS_PER_TOKEN)
+        )
+        .over(order_by=_NEWEST_FIRST, rows=(None, 0))
+        .label("running_tokens"),
+    )
+    .where(MessageDB.conversation_id == bindparam("conversation_id"))
+    .cte("ranked_messages")
+)
+_GET_RECENT_MESSAGES_STMT = (
+    select(MessageDB)
+    .join(_RANKED_MESSAGES, MessageDB.id == _RANKED_MESSAGES.c.id)
+    .where(
+        or_(
+            _RANKED_MESSAGES.c.running_tokens <= bindparam("max_tokens"),
+            _RANKED_MESSAGES.c.position == 1,
+        )
+    )
+    .order_by(MessageDB.created_at, MessageDB.id)
+)
+
+
+def _message_tokens(
+    content: str, tool_calls: list[dict] | None, tool_results: list[dict] | None
+) -> int:
+    """Estimate the tokens a message can add to an agent's history.
+
+    Recent tool-using turns are replayed with their tool calls and results, so
+    those count too; this over-counts older turns that are sent as text only,
+    which keeps history within the budget either way.
+    """
+    chars = len(content)
+    if tool_calls:
+        chars += len(to_json(tool_calls))
+    if tool_results:
+        chars += sum(len(tool_result.get("content", "")) for tool_result in tool_results)
+    return chars // _CHARS_PER_TOKEN
+
+
+class ConversationNotFoundError(ValueError):
+    """Raised when an operation targets a conversation that does not exist."""
+
+    pass
 
 
 class ConversationManager:
-    """Manages conversation threads and message history."""
+    """Manages conversation threads and message history.
+
+    A manager is a thin per-request wrapper around a session: it holds no
+    other state, and its statements live at module level (or in
+    lambda_stmt's cache), so nothing is rebuilt when one is created.
+    """
+
+    __slots__ = ("db",)
 
     def __init__(self, db: AsyncSession):
         """Initialize with database session.
@@ -74,12 +153,25 @@ class ConversationManager:
 
         Returns:
             Created message
+
+        Raises:
+            ConversationNotFoundError: If the conversation does not exist
         """
+        # Touch the conversation's updated_at in a single UPDATE, which also
+        # tells us whether it exists without loading the row
+        touched = await self.db.execute(
+            update(ConversationDB)
+            .where(ConversationDB.id == conversation_id)
+            .values(updated_at=datetime.now(UTC))
+        )
+        if touched.rowcount == 0:
+            raise ConversationNotFoundError(f"Conversation {conversation_id} not found")
 
         message_db = MessageDB(
             conversation_id=conversation_id,
             role=role,
             content=content,
+            token_count=_message_tokens(content, tool_calls, tool_results),
             tool_calls=tool_calls,
             tool_results=tool_results,
             adapter_name=adapter_name,
@@ -88,13 +180,9 @@ class ConversationManager:
 
         self.db.add(message_db)
 
-        # Update conversation's updated_at timestamp
-        conversation_db = await self.db.get(ConversationDB, conversation_id)
-        if conversation_db:
-            conversation_db.updated_at = datetime.now(UTC)
-
+        # id and created_at are client-side defaults, populated at flush; the
+        # session doesn't expire on commit, so no refresh round-trip is needed
         await self.db.commit()
-        await self.db.refresh(message_db)
 
         return self._message_to_domain(message_db)
 
@@ -110,13 +198,13 @@ class ConversationManager:
         Returns:
             Conversation thread or None if not found
         """
-        query = select(ConversationDB).where(ConversationDB.id == conversation_id)
-
+        params = {"conversation_id": conversation_id}
         if load_messages:
-            query = query.options(selectinload(ConversationDB.messages))
-
-        result = await self.db.execute(query)
-        conversation_db = result.scalar_one_or_none()
+            result = await self.db.execute(_GET_CONVERSATION_WITH_MESSAGES_STMT, params)
+            conversation_db = result.scalar_one_or_none()
+        else:
+            result = await self.db.execute(_GET_CONVERSATION_STMT, params)
+            conversation_db = result.one_or_none()
 
         if not conversation_db:
             return None
@@ -136,21 +224,216 @@ class ConversationManager:
         Returns:
             List of messages
         """
-        query = (
-            select(MessageDB)
-            .where(MessageDB.conversation_id == conversation_id)
-            .order_by(MessageDB.created_at)
-            .offset(offset)
+        # lambda_stmt caches the built statement by the lambdas' code locations,
+        # so repeat calls skip constructing and cache-keying the expression tree;
+        # conversation_id, offset and limit are extracted as bound parameters
+        #
+        # id breaks created_at ties so history always replays in the same order;
+        # the agent prompt is rebuilt from it every turn, and a stable prefix is
+        # what lets provider-side prompt caches hit
+        query = lambda_stmt(
+            lambda: (
+                select(MessageDB)
+                .where(MessageDB.conversation_id == conversation_id)
+                .order_by(MessageDB.created_at, MessageDB.id)
+                .offset(offset)
+            )
         )
 
         if limit:
-            query = query.limit(limit)
+            query += lambda s: s.limit(limit)
 
         result = await self.db.execute(query)
         messages_db = result.scalars().all()
 
         return [self._message_to_domain(msg) for msg in messages_db]
 
+    async def get_history(
+        self, conversation_id: UUID, window: int = 0, max_tokens: int = 0
+    ) -> list[Message]:
+        """Retrieve the window of message history sent to an agent.
+
+        With a window of N, the window starts at a multiple of N and grows
+        from N to 2N - 1 messages before snapping forward by N. Its start stays
+        put for N consecutive turns, so each turn's prompt extends the previous
+        one and provider-side prompt caches keep hitting, unlike a sliding
+        window that changes the prefix every turn.
+
+        A token budget, when given, takes the place of the message window: the
+        history is then the most recent messages that fit the budget.
+
+        Args:
+            conversation_id: Conversation identifier
+            window: Window size in messages; 0 returns the full history
+            max_tokens: Token budget for the history; 0 for no budget
+
+        Returns:
+            Messages in the window, oldest first
+        """
+        if max_tokens > 0:
+            return await self.get_recent_messages(conversation_id, max_tokens)
+
+        if window <= 0:
+            return await self.get_messages(conversation_id)
+
+        # The window start is computed from the message count inside the
+        # OFFSET, so this is a single round-trip
+        query = lambda_stmt(
+            lambda: (
+                select(MessageDB)
+                .where(MessageDB.conversation_id == conversation_id)
+                .order_by(MessageDB.created_at, MessageDB.id)
+                .offset(
+                    func.greatest(
+                        0,
+                        (
+                            select(func.count())
+                            .select_from(MessageDB)
+                            .where(MessageDB.conversation_id == conversation_id)
+                            .scalar_subquery()
+                            - window
+                        )
+                        // window
+                        * window,
+                    )
+                )
+            )
+        )
+
+        result = await self.db.execute(query)
+        return [self._message_to_domain(msg) for msg in result.scalars().all()]
+
+    async def get_recent_messages(self, conversation_id: UUID, max_tokens: int) -> list[Message]:
+        """Retrieve the most recent messages that fit a token budget.
+
+        The budget is applied in SQL with a running sum over the stored token
+        counts, so only the selected rows are transferred and no per-message
+        work is done in Python. The newest message is always included.
+
+        Args:
+            conversation_id: Conversation identifier
+            max_tokens: Token budget for the returned messages
+
+        Returns:
+            Messages within the budget, oldest first
+        """
+        result = await self.db.execute(
+            _GET_RECENT_MESSAGES_STMT,
+            {"conversation_id": conversation_id, "max_tokens": max_tokens},
+        )
+        return [self._message_to_domain(msg) for msg in result.scalars().all()]
+
+    async def get_last_user_message(self, conversation_id: UUID) -> Message | None:
+        """Retrieve the most recent user message in a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+
+        Returns:
+            The latest user message, or None if there is none
+        """
+        # Walks the (conversation_id, created_at) index backwards and stops at
+        # the first user row, so only one row is transferred
+        query = lambda_stmt(
+            lambda: (
+                select(MessageDB)
+                .where(
+                    MessageDB.conversation_id == conversation_id,
+                    MessageDB.role == MessageRole.USER,
+                )
+                .order_by(MessageDB.created_at.desc(), MessageDB.id.desc())
+                .limit(1)
+            )
+        )
+        result = await self.db.execute(query)
+        message_db = result.scalar_one_or_none()
+        return self._message_to_domain(message_db) if message_db is not None else None
+
+    async def add_and_fetch(
+        self,
+        conversation_id: UUID,
+        role: MessageRole,
+        content: str,
+        window: int = 0,
+        max_tokens: int = 0,
+    ) -> tuple[Message, list[Message]]:
+        """Add a message and load the history that precedes it.
+
+        The history is read in the same transaction as the insert, which is
+        committed once, instead of a separate read after the commit.
+
+        Args:
+            conversation_id: Conversation identifier
+            role: Message role
+            content: Message content
+            window: History window size, as for get_history()
+            max_tokens: History token budget, as for get_history()
+
+        Returns:
+            The created message, and the history before it, oldest first
+
+        Raises:
+            ConversationNotFoundError: If the conversation does not exist
+        """
+        history = await self.get_history(conversation_id, window=window, max_tokens=max_tokens)
+        message = await self.add_message(conversation_id, role, content)
+        return message, history
+
+    async def get_message_page(
+        self,
+        conversation_id: UUID,
+        limit: int = 50,
+        before: datetime | None = None,
+        before_id: UUID | None = None,
+    ) -> MessagePage:
+        """Retrieve one page of message history, newest page first.
+
+        Uses keyset pagination on (created_at, id), the order history is
+        replayed in, so each page is an index range scan regardless of how
+        deep into the history it is, and messages sharing a timestamp at a
+        page boundary are neither skipped nor repeated.
+
+        Args:
+            conversation_id: Conversation identifier
+            limit: Maximum number of messages in the page
+            before: Only return messages before this cursor timestamp
+            before_id: Cursor message id; with before, only return messages
+                ordered before that message
+
+        Returns:
+            Page of messages in chronological order, with the cursor for the
+            next older page
+        """
+        query = lambda_stmt(
+            lambda: select(MessageDB).where(MessageDB.conversation_id == conversation_id)
+        )
+        if before is not None and before_id is not None:
+            query += lambda s: s.where(
+                tuple_(MessageDB.created_at, MessageDB.id) < tuple_(before, before_id)
+            )
+        elif before is not None:
+            query += lambda s: s.where(MessageDB.created_at < before)
+
+        # Fetch one extra row to learn whether an older page exists
+        fetch_limit = limit + 1
+        query += lambda s: s.order_by(MessageDB.created_at.desc(), MessageDB.id.desc()).limit(
+            fetch_limit
+        )
+
+        result = await self.db.execute(query)
+        messages_db = result.scalars().all()
+
+        has_more = len(messages_db) > limit
+        page = [self._message_to_domain(msg) for msg in reversed(messages_db[:limit])]
+
+        if not has_more:
+            return MessagePage(messages=page)
+        return MessagePage(
+            messages=page,
+            next_cursor=page[0].created_at,
+            next_cursor_id=page[0].id,
+        )
+
     async def continue_thread(self, conversation_id: UUID, user_message: str) -> ConversationThread:
         """Continue an existing thread with a follow-up message.
 
@@ -161,13 +444,14 @@ class ConversationManager:
         Returns:
             Updated conversation thread
         """
-        # Add the user message
-        await self.add_message(conversation_id, MessageRole.USER, user_message)
-
-        # Get and return the updated conversation
         conversation = await self.get_conversation(conversation_id, load_messages=True)
         if not conversation:
-            raise ValueError(f"Conversation {conversation_id} not found")
+            raise ConversationNotFoundError(f"Conversation {conversation_id} not found")
+
+        # Add the user message and append it to the history already loaded,
+        # rather than reloading every message
+        message = await self.add_message(conversation_id, MessageRole.USER, user_message)
+        conversation.append_message(message)
 
         return conversation
 
@@ -188,16 +472,21 @@ class ConversationManager:
 
     @staticmethod
     def _to_domain(
-        conversation_db: ConversationDB, include_messages: bool = False
+        conversation_db: ConversationDB | Row, include_messages: bool = False
     ) -> ConversationThread:
-        """Convert database model to domain model."""
+        """Convert database model (or a conversations table row) to domain model.
+
+        Database values are already typed by the column types, so the domain
+        model is built with model_construct and skips validation (including
+        enum coercion).
+        """
         messages = []
         if include_messages and conversation_db.messages:
             messages = [
                 ConversationManager._message_to_domain(msg) for msg in conversation_db.messages
             ]
 
-        return ConversationThread(
+        return ConversationThread.model_construct(
             id=conversation_db.id,
             user_id=conversation_db.user_id,
             created_at=conversation_db.created_at,
@@ -211,8 +500,8 @@ class ConversationManager:
 
     @staticmethod
     def _message_to_domain(message_db: MessageDB) -> Message:
-        """Convert database message to domain message."""
-        return Message(
+        """Convert database message to domain message, without re-validation."""
+        return Message.model_construct(
             id=message_db.id,
             conversation_id=message_db.conversation_id,
             role=message_db.role,
@@ -0,0 +1,119 @@
+"""Redis-backed cache for agent responses."""
+
+import logging
+from hashlib import blake2b
+
+from pydantic_core import to_json
+from redis.asyncio import Redis
+
+from app.config import get_settings
+from app.runners.models import AgentMessage
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ResponseCache:
+    """Caches complete agent responses keyed on the full model input.
+
+    A key covers the model, system prompt and the whole message history
+    (including the new prompt), so a hit is only possible when the agent would
+    see exactly the same input again. Cache errors are logged and treated as
+    misses; they never fail a request.
+    """
+
+    def __init__(self, redis_url: str, ttl: int, namespace: str):
+        """Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL
+            ttl: Time-to-live for cached responses in seconds
+            namespace: Key namespace, typically the model name
+        """
+        self.ttl = ttl
+        self.namespace = namespace
+        self._redis = Redis.from_url(redis_url)
+
+    def make_key(
+        self, history: list[AgentMessage], prompt: str, system_prompt: str | None = None
+    ) -> str:
+        """Build the cache key for one agent call.
+
+        Args:
+            history: Message history passed to the runner
+            prompt: Prompt passed to the runner
+            system_prompt: Optional system prompt override
+
+        Returns:
+            Cache key string
+        """
+        payload = to_json(
+            [
+                self.namespace,
+                system_prompt,
+                [(msg.role.value, msg.content) for msg in history],
+                prompt,
+            ]
+        )
+        return f"llm:{blake2b(payload, digest_size=16).hexdigest()}"
+
+    async def get(self, key: str) -> str | None:
+        """Get a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on a miss or cache error
+        """
+        try:
+            value = await self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+        return value.decode() if value is not None else None
+
+    async def set(self, key: str, response: str) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            response: Complete response text
+        """
+        try:
+            await self._redis.set(key, response, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool."""
+        await self._redis.aclose()
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Get the shared response cache, or None when caching is disabled.
+
+    Returns:
+        ResponseCache instance if llm_cache_enabled is set, otherwise None
+    """
+    global _response_cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            redis_url=settings.redis_url,
+            ttl=settings.redis_cache_ttl,
+            namespace=settings.default_model,
+        )
+    return _response_cache
+
+
+async def close_response_cache() -> None:
+    """Close the shared response cache if it was created."""
+    global _response_cache
+    if _response_cache is not None:
+        await _response_cache.aclose()
+        _response_cache = None
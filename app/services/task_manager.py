@@ -2,17 +2,19 @@
 
 import logging
 from datetime import UTC, datetime
+from itertools import product
 from uuid import UUID
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, Select, bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 
-from app.config import create_agent_runner
+from app.config import get_agent_runner
 from app.database.models import ConversationDB, TaskDB
 from app.models.domain import (
     NotificationConfig,
     Task,
     TaskStatus,
+    TaskSummary,
     TaskType,
 )
 from app.services.agent_executor import AgentExecutor
@@ -22,6 +24,56 @@ from app.services.notification_service import NotificationService
 logger = logging.getLogger(__name__)
 
 
+# Columns returned by task summary listings; the JSON config and notification
+# columns are left out to keep large listings cheap
+_TASK_SUMMARY_COLUMNS = (
+    TaskDB.id,
+    TaskDB.user_id,
+    TaskDB.conversation_id,
+    TaskDB.task_type,
+    TaskDB.status,
+    TaskDB.prompt,
+    TaskDB.schedule_expression,
+    TaskDB.started_at,
+    TaskDB.completed_at,
+    TaskDB.error_message,
+    TaskDB.is_active,
+    TaskDB.last_run_at,
+    TaskDB.next_run_at,
+    TaskDB.created_at,
+    TaskDB.updated_at,
+)
+
+# Rows fetched per round-trip when streaming task listings
+_LIST_TASKS_BATCH_SIZE = 500
+
+
+def _build_list_tasks_stmt(
+    include_config: bool, filter_task_type: bool, filter_is_active: bool
+) -> Select:
+    """Build the list_user_tasks statement for one combination of options."""
+    if include_config:
+        query = select(TaskDB.__table__)
+    else:
+        query = select(*_TASK_SUMMARY_COLUMNS)
+    query = query.where(TaskDB.user_id == bindparam("user_id"))
+    if filter_task_type:
+        query = query.where(TaskDB.task_type == bindparam("task_type"))
+    if filter_is_active:
+        query = query.where(TaskDB.is_active == bindparam("is_active"))
+    return query.order_by(TaskDB.created_at.desc())
+
+
+# Read-only lookup by id; selecting from the table returns a Core Row and skips
+# ORM identity-map and instance-state bookkeeping
+_GET_TASK_STMT = select(TaskDB.__table__).where(TaskDB.id == bindparam("task_id"))
+
+# One prebuilt statement per (config included, task_type given, is_active given)
+_LIST_TASKS_STMTS: dict[tuple[bool, bool, bool], Select] = {
+    key: _build_list_tasks_stmt(*key) for key in product((False, True), repeat=3)
+}
+
+
 class TaskManager:
     """Manages task lifecycle: creation, execution, status tracking."""
 
@@ -118,8 +170,8 @@ class TaskManager:
         await self.db.commit()
 
         try:
-            # Create runner and executor
-            runner = create_agent_runner()
+            # Reuse the shared runner and create executor
+            runner = get_agent_runner()
             agent_executor = AgentExecutor(runner, self.conversation_manager)
             result = await agent_executor.execute_async(
                 conversation_id=task_db.conversation_id, prompt=task_db.prompt
@@ -158,16 +210,23 @@ class TaskManager:
         Returns:
             Task or None if not found
         """
-        task_db = await self.db.get(TaskDB, task_id)
-        if not task_db:
+        result = await self.db.execute(_GET_TASK_STMT, {"task_id": task_id})
+        row = result.one_or_none()
+        if not row:
             return None
-        return self._to_domain(task_db)
+        return self._to_domain(row)
 
     async def list_user_tasks(
-        self, user_id: str, task_type: TaskType | None = None, is_active: bool | None = None
+        self,
+        user_id: str,
+        task_type: TaskType | None = None,
+        is_active: bool | None = None,
     ) -> list[Task]:
         """List all tasks for a user.
 
+        Rows are streamed from a server-side cursor in batches rather than
+        buffered in one result.
+
         Args:
             user_id: User identifier
             task_type: Optional filter by task type
@@ -176,20 +235,52 @@ class TaskManager:
         Returns:
             List of tasks
         """
-        query = select(TaskDB).where(TaskDB.user_id == user_id)
+        result = await self._stream_user_tasks(True, user_id, task_type, is_active)
+        return [self._to_domain(row) async for row in result.yield_per(_LIST_TASKS_BATCH_SIZE)]
 
-        if task_type:
-            query = query.where(TaskDB.task_type == task_type)
+    async def list_user_task_summaries(
+        self,
+        user_id: str,
+        task_type: TaskType | None = None,
+        is_active: bool | None = None,
+    ) -> list[TaskSummary]:
+        """List a user's tasks without their configuration.
 
-        if is_active is not None:
-            query = query.where(TaskDB.is_active == is_active)
+        Like list_user_tasks(), but the JSON config and notification columns
+        are not selected, which keeps large listings cheap.
 
-        query = query.order_by(TaskDB.created_at.desc())
+        Args:
+            user_id: User identifier
+            task_type: Optional filter by task type
+            is_active: Optional filter by active status
 
-        result = await self.db.execute(query)
-        tasks_db = result.scalars().all()
+        Returns:
+            List of task summaries
+        """
+        result = await self._stream_user_tasks(False, user_id, task_type, is_active)
+        return [
+            TaskSummary(**row._mapping) async for row in result.yield_per(_LIST_TASKS_BATCH_SIZE)
+        ]
 
-        return [self._to_domain(task) for task in tasks_db]
+    async def _stream_user_tasks(
+        self,
+        include_config: bool,
+        user_id: str,
+        task_type: TaskType | None,
+        is_active: bool | None,
+    ) -> AsyncResult:
+        """Start streaming a user's tasks with the prebuilt listing statement."""
+        filter_task_type = bool(task_type)
+        filter_is_active = is_active is not None
+        query = _LIST_TASKS_STMTS[include_config, filter_task_type, filter_is_active]
+
+        params: dict = {"user_id": user_id}
+        if filter_task_type:
+            params["task_type"] = task_type
+        if filter_is_active:
+            params["is_active"] = is_active
+
+        return await self.db.stream(query, params)
 
     async def update_task(
         self,
@@ -277,8 +368,8 @@ class TaskManager:
         return mapping.get(task_type, "delegation")
 
     @staticmethod
-    def _to_domain(task_db: TaskDB) -> Task:
-        """Convert database model to domain model."""
+    def _to_domain(task_db: TaskDB | Row) -> Task:
+        """Convert database model (or a tasks table row) to domain model."""
         from app.models.domain import NotificationChannel
 
         # Reconstruct notification config
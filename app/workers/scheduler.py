@@ -99,7 +99,7 @@ async def load_scheduled_tasks() -> None:
 
         # Get all active scheduled tasks for all users
         # Note: In production, you might want to paginate or limit this
-        tasks = await manager.list_user_tasks(
+        tasks = await manager.list_user_task_summaries(
             user_id="",  # Empty to get all users' tasks
             task_type=TaskType.SCHEDULED,
             is_active=True,
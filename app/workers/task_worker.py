@@ -4,13 +4,17 @@ import logging
 from typing import ClassVar
 from uuid import UUID
 
-from arq import create_pool
+from arq import ArqRedis, create_pool
 from arq.connections import RedisSettings
 
-from app.config import get_settings, create_agent_runner
+from app.config import get_agent_runner, get_settings
 from app.database import AsyncSessionLocal
-from app.services.channel_adapter_manager import ChannelAdapterManager, initialize_adapters
 from app.services.agent_executor import AgentExecutor
+from app.services.channel_adapter_manager import (
+    ChannelAdapterManager,
+    close_adapters,
+    initialize_adapters,
+)
 from app.services.conversation_manager import ConversationManager
 from app.services.task_manager import TaskManager
 
@@ -23,6 +27,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Shared ARQ connection pool for enqueueing, created on first use
+_arq_pool: ArqRedis | None = None
+
+
+async def get_arq_pool() -> ArqRedis:
+    """Get the shared ARQ Redis pool, creating it on first use.
+
+    Returns:
+        ArqRedis connection pool
+    """
+    global _arq_pool
+    if _arq_pool is None:
+        _arq_pool = await create_pool(RedisSettings.from_dsn(settings.arq_redis_url))
+    return _arq_pool
+
+
+async def close_arq_pool() -> None:
+    """Close the shared ARQ Redis pool if it was created."""
+    global _arq_pool
+    if _arq_pool is not None:
+        await _arq_pool.aclose()
+        _arq_pool = None
+
 
 async def execute_task_job(ctx: dict, task_id: str) -> None:
     """Background job to execute a task.
@@ -57,9 +84,6 @@ async def process_conversation_job(ctx: dict, conversation_id: str) -> None:
     logger.info(f"Processing conversation {conversation_uuid}")
 
     try:
-        # Initialize adapters (in case this is the first time the worker is running)
-        await initialize_adapters()
-
         async with AsyncSessionLocal() as db:
             conversation_manager = ConversationManager(db)
             adapter_manager = ChannelAdapterManager(db)
@@ -71,7 +95,7 @@ async def process_conversation_job(ctx: dict, conversation_id: str) -> None:
                 return
 
             # Execute agent on the existing conversation
-            runner = create_agent_runner()
+            runner = get_agent_runner()
             executor = AgentExecutor(runner, conversation_manager)
             response = await executor.execute_on_existing_conversation(conversation_uuid)
 
@@ -118,9 +142,7 @@ async def enqueue_task(task_id: UUID) -> None:
     Args:
         task_id: Task identifier
     """
-    redis = await create_pool(
-        RedisSettings.from_dsn(settings.arq_redis_url),
-    )
+    redis = await get_arq_pool()
 
     job = await redis.enqueue_job("execute_task_job", str(task_id))
     if job:
@@ -135,9 +157,7 @@ async def enqueue_conversation_processing(conversation_id: UUID) -> None:
     Args:
         conversation_id: Conversation identifier
     """
-    redis = await create_pool(
-        RedisSettings.from_dsn(settings.arq_redis_url),
-    )
+    redis = await get_arq_pool()
 
     job = await redis.enqueue_job("process_conversation_job", str(conversation_id))
     if job:
@@ -146,11 +166,34 @@ async def enqueue_conversation_processing(conversation_id: UUID) -> None:
         logger.warning(f"Failed to enqueue conversation {conversation_id}")
 
 
+async def startup(ctx: dict) -> None:
+    """Register channel adapters once per worker process.
+
+    Jobs share these adapters (and their pooled HTTP sessions) instead of
+    creating them per job.
+
+    Args:
+        ctx: ARQ context
+    """
+    await initialize_adapters()
+
+
+async def shutdown(ctx: dict) -> None:
+    """Release adapter resources when the worker stops.
+
+    Args:
+        ctx: ARQ context
+    """
+    await close_adapters()
+
+
 # ARQ Worker Configuration
 class WorkerSettings:
     """Configuration for ARQ worker."""
 
     functions: ClassVar = [execute_task_job, process_conversation_job]
+    on_startup: ClassVar = startup
+    on_shutdown: ClassVar = shutdown
     redis_settings: ClassVar = RedisSettings.from_dsn(settings.arq_redis_url)
     max_jobs: ClassVar = settings.max_worker_jobs
     job_timeout: ClassVar = 600  # 10 minutes
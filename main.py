@@ -5,8 +5,14 @@ __all__ = ["app"]
 if __name__ == "__main__":
     import uvicorn
 
+    # uvloop and httptools ship with uvicorn[standard]; request them explicitly
+    # so a missing extra fails loudly instead of silently falling back to
+    # asyncio and h11. A single worker is intentional: the API process runs
+    # the APScheduler instance, which would fire every job once per worker.
     uvicorn.run(
-        app,
+        "app.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
     )